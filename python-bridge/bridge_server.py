@@ -10,14 +10,41 @@ Protocol:
     Response: {"id": "...", "success": true, "result": {...}}
     Error:    {"id": "...", "success": false, "error": "..."}
 
-All byte arrays are hex-encoded strings.
+Several requests can be sent as one batch, {"id": "...", "batch": [request, ...]},
+which is answered with {"id": "...", "batch": [response, ...]} in the same
+order. Each entry succeeds or fails on its own; batches cannot be nested.
+
+All byte arrays are hex-encoded strings (base64 when the bridge is started
+with BRIDGE_BYTES_ENCODING=base64). PythonBridge.kt only speaks the default
+hex JSON protocol; the other modes are covered by BridgeProtocolTest.
+
+Started with --parallel, the bridge runs POOL_SAFE_COMMANDS in a process pool
+and answers them as they finish, out of request order; clients must match
+responses to requests by id. PythonBridge.kt reads one response per request
+in order and so does not support this mode.
+
+With BRIDGE_TRANSPORT=msgpack, requests and responses are instead MessagePack
+maps with the same fields, each preceded by a 4-byte big-endian length, and
+byte arrays are sent as raw bin values.
 """
 
 import sys
 import os
+import bz2
 import json
+import collections
+import binascii
+import struct
+import select
+import functools
+import shutil
+import tempfile
+import threading
+import subprocess
+import time
 import traceback
 import multiprocessing
+import concurrent.futures
 
 # Patch multiprocessing.set_start_method to be no-op after first call
 # This is needed because LXMF.LXStamper calls it without force=True,
@@ -47,6 +74,7 @@ lxmf_path = os.path.abspath(os.environ.get('PYTHON_LXMF_PATH', '../../../LXMF'))
 sys.path.insert(0, lxmf_path)
 
 import hashlib
+import hmac
 
 # Import umsgpack from RNS vendor
 sys.path.insert(0, os.path.join(rns_path, 'RNS', 'vendor'))
@@ -80,22 +108,9 @@ def load_module_from_path(name, path):
 # Load cryptography modules directly
 crypto_path = os.path.join(rns_path, 'RNS', 'Cryptography')
 
-# Load HMAC first (needed by others)
-HMAC = load_module_from_path('RNS_HMAC', os.path.join(crypto_path, 'HMAC.py'))
-
 # Load X25519
 X25519 = load_module_from_path('RNS_X25519', os.path.join(crypto_path, 'X25519.py'))
 
-# Load HKDF (depends on HMAC)
-# We need to patch the import
-hkdf_code = open(os.path.join(crypto_path, 'HKDF.py')).read()
-hkdf_code = hkdf_code.replace('from RNS.Cryptography import HMAC', '')
-hkdf_module = type(sys)('RNS_HKDF')
-hkdf_module.HMAC = HMAC
-exec(compile(hkdf_code, 'HKDF.py', 'exec'), hkdf_module.__dict__)
-sys.modules['RNS_HKDF'] = hkdf_module
-HKDF = hkdf_module
-
 # Load PKCS7 (functions are in PKCS7.PKCS7 class)
 PKCS7_module = load_module_from_path('RNS_PKCS7', os.path.join(crypto_path, 'PKCS7.py'))
 PKCS7 = PKCS7_module.PKCS7
@@ -104,11 +119,51 @@ PKCS7 = PKCS7_module.PKCS7
 aes128_module = load_module_from_path('RNS_AES128', os.path.join(crypto_path, 'aes', 'aes128.py'))
 aes256_module = load_module_from_path('RNS_AES256', os.path.join(crypto_path, 'aes', 'aes256.py'))
 
+# Prefer OpenSSL's AES (AES-NI where the CPU has it) via `cryptography`, the
+# same provider RNS itself selects when available. The pure Python modules
+# above remain the fallback so the bridge still runs without it installed.
+try:
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    # Releases before 3.1 require an explicit backend; later ones ignore it
+    _AES_BACKEND = default_backend()
+    _HAVE_CRYPTOGRAPHY_AES = True
+except ImportError:
+    _HAVE_CRYPTOGRAPHY_AES = False
+
+# Without `cryptography`, large payloads are piped through the system openssl
+# binary instead: above a few KB the process spawn costs far less than the
+# pure Python AES rounds. Small payloads stay in-process.
+_OPENSSL_CLI = None if _HAVE_CRYPTOGRAPHY_AES else shutil.which('openssl')
+_OPENSSL_CLI_MIN_BYTES = 4096
+
+def _openssl_cli_cbc(data, key, iv, decrypt=False):
+    # `openssl enc` only takes a raw key and IV as -K/-iv arguments (-kfile and
+    # -pass feed a passphrase KDF instead), so both are briefly visible in the
+    # process list. That is acceptable here: the bridge is a local test
+    # harness whose keys are throwaway test vectors, not secrets.
+    command = [_OPENSSL_CLI, 'enc', f'-aes-{len(key)*8}-cbc', '-K', key.hex(), '-iv', iv.hex(), '-nopad']
+    if decrypt:
+        command.append('-d')
+    return subprocess.run(command, input=data, capture_output=True, check=True).stdout
+
+def _openssl_cbc_encrypt(plaintext, key, iv):
+    encryptor = Cipher(algorithms.AES(key), modes.CBC(iv), backend=_AES_BACKEND).encryptor()
+    return encryptor.update(plaintext) + encryptor.finalize()
+
+def _openssl_cbc_decrypt(ciphertext, key, iv):
+    decryptor = Cipher(algorithms.AES(key), modes.CBC(iv), backend=_AES_BACKEND).decryptor()
+    return decryptor.update(ciphertext) + decryptor.finalize()
+
 class AES_128_CBC:
     @staticmethod
     def encrypt(plaintext, key, iv):
         if len(key) != 16:
             raise ValueError(f"Invalid key length {len(key)*8} for AES-128")
+        if _HAVE_CRYPTOGRAPHY_AES:
+            return _openssl_cbc_encrypt(plaintext, key, iv)
+        if _OPENSSL_CLI and len(plaintext) > _OPENSSL_CLI_MIN_BYTES:
+            return _openssl_cli_cbc(plaintext, key, iv)
         cipher = aes128_module.AES128(key)
         return cipher.encrypt(plaintext, iv)
 
@@ -116,6 +171,10 @@ class AES_128_CBC:
     def decrypt(ciphertext, key, iv):
         if len(key) != 16:
             raise ValueError(f"Invalid key length {len(key)*8} for AES-128")
+        if _HAVE_CRYPTOGRAPHY_AES:
+            return _openssl_cbc_decrypt(ciphertext, key, iv)
+        if _OPENSSL_CLI and len(ciphertext) > _OPENSSL_CLI_MIN_BYTES:
+            return _openssl_cli_cbc(ciphertext, key, iv, decrypt=True)
         cipher = aes128_module.AES128(key)
         return cipher.decrypt(ciphertext, iv)
 
@@ -124,6 +183,10 @@ class AES_256_CBC:
     def encrypt(plaintext, key, iv):
         if len(key) != 32:
             raise ValueError(f"Invalid key length {len(key)*8} for AES-256")
+        if _HAVE_CRYPTOGRAPHY_AES:
+            return _openssl_cbc_encrypt(plaintext, key, iv)
+        if _OPENSSL_CLI and len(plaintext) > _OPENSSL_CLI_MIN_BYTES:
+            return _openssl_cli_cbc(plaintext, key, iv)
         cipher = aes256_module.AES256(key)
         return cipher.encrypt_cbc(plaintext, iv)
 
@@ -131,51 +194,472 @@ class AES_256_CBC:
     def decrypt(ciphertext, key, iv):
         if len(key) != 32:
             raise ValueError(f"Invalid key length {len(key)*8} for AES-256")
+        if _HAVE_CRYPTOGRAPHY_AES:
+            return _openssl_cbc_decrypt(ciphertext, key, iv)
+        if _OPENSSL_CLI and len(ciphertext) > _OPENSSL_CLI_MIN_BYTES:
+            return _openssl_cli_cbc(ciphertext, key, iv, decrypt=True)
         cipher = aes256_module.AES256(key)
         return cipher.decrypt_cbc(ciphertext, iv)
 
-# Load Token (depends on HMAC, PKCS7, AES)
-token_code = open(os.path.join(crypto_path, 'Token.py')).read()
-token_module = type(sys)('RNS_Token')
-token_module.os = os
-token_module.time = __import__('time')
-token_module.HMAC = HMAC
-token_module.PKCS7 = PKCS7
-token_module.AES = type(sys)('AES')
-token_module.AES.AES_128_CBC = AES_128_CBC
-token_module.AES.AES_256_CBC = AES_256_CBC
-token_module.AES_128_CBC = AES_128_CBC
-token_module.AES_256_CBC = AES_256_CBC
-# Remove import statements and execute
-import re
-token_code = re.sub(r'^from RNS\.Cryptography.*$', '', token_code, flags=re.MULTILINE)
-token_code = re.sub(r'^import (?:os|time)$', '', token_code, flags=re.MULTILINE)
-exec(compile(token_code, 'Token.py', 'exec'), token_module.__dict__)
-sys.modules['RNS_Token'] = token_module
-Token = token_module
-
-# Pre-register a fake RNS.Cryptography.Hashes module to satisfy eddsa.py import
-# This prevents triggering the full RNS import chain
+# Token and HKDF only need HMAC.new(key, msg).digest() and compare_digest;
+# hand them the stdlib implementation (OpenSSL's HMAC) instead of loading
+# the pure Python port in RNS/Cryptography/HMAC.py.
+HMAC = type(sys)('RNS.Cryptography.HMAC')
+HMAC.new = lambda key, msg=None, digestmod=hashlib.sha256: hmac.new(key, msg, digestmod)
+HMAC.compare_digest = hmac.compare_digest
+
+# Stand-in RNS package modules. HKDF.py and Token.py import their
+# dependencies from RNS.Cryptography, and pure25519's eddsa.py imports
+# RNS.Cryptography.Hashes; registering these lets those files be imported
+# as-is (with normal bytecode caching) without triggering the full RNS
+# import chain, and routes Token to the AES classes above.
 fake_rns = type(sys)('RNS')
 fake_crypto = type(sys)('RNS.Cryptography')
 fake_hashes = type(sys)('RNS.Cryptography.Hashes')
+fake_aes = type(sys)('RNS.Cryptography.AES')
 fake_hashes.sha512 = lambda data: hashlib.sha512(data).digest()
+fake_aes.AES_128_CBC = AES_128_CBC
+fake_aes.AES_256_CBC = AES_256_CBC
 sys.modules['RNS'] = fake_rns
 sys.modules['RNS.Cryptography'] = fake_crypto
 sys.modules['RNS.Cryptography.Hashes'] = fake_hashes
+sys.modules['RNS.Cryptography.AES'] = fake_aes
 fake_rns.Cryptography = fake_crypto
 fake_crypto.Hashes = fake_hashes
+fake_crypto.HMAC = HMAC
+fake_crypto.PKCS7 = PKCS7
+fake_crypto.AES = fake_aes
+
+# Load HKDF (depends on HMAC) and Token (depends on HMAC, PKCS7, AES)
+HKDF = load_module_from_path('RNS_HKDF', os.path.join(crypto_path, 'HKDF.py'))
+Token = load_module_from_path('RNS_Token', os.path.join(crypto_path, 'Token.py'))
+
+# Ed25519: use OpenSSL through `cryptography` when available, otherwise the
+# pure25519 implementation bundled with RNS (which needs the fake Hashes module
+# above). Both expose the pure25519 ed25519_oop API used by the handlers:
+# SigningKey(seed).vk_s / .sign(msg) and VerifyingKey(pub).verify(sig, msg).
+try:
+    from cryptography.hazmat.primitives import serialization as _serialization
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+
+    class Ed25519SigningKey:
+        def __init__(self, sk_s):
+            # pure25519 also accepts seed + public key (64 bytes). It would sign
+            # with whatever public half it is given, whereas OpenSSL always
+            # derives it from the seed, so an inconsistent pair is rejected
+            # rather than silently producing different signatures.
+            if len(sk_s) == 64:
+                seed, public_half = sk_s[:32], sk_s[32:]
+            elif len(sk_s) == 32:
+                seed, public_half = sk_s, None
+            else:
+                raise ValueError("SigningKey takes 32-byte seed or 64-byte string")
+            self._sk = Ed25519PrivateKey.from_private_bytes(seed)
+            if public_half is not None and public_half != self.vk_s:
+                raise ValueError("SigningKey public half does not match the key derived from the seed")
+
+        @functools.cached_property
+        def vk_s(self):
+            # Only derived when asked for; signing doesn't need it
+            return self._sk.public_key().public_bytes(
+                encoding=_serialization.Encoding.Raw,
+                format=_serialization.PublicFormat.Raw
+            )
+
+        def sign(self, msg):
+            return self._sk.sign(msg)
+
+    class Ed25519VerifyingKey:
+        def __init__(self, vk_s):
+            self._vk = Ed25519PublicKey.from_public_bytes(vk_s)
+
+        def verify(self, sig, msg):
+            self._vk.verify(sig, msg)
+
+except ImportError:
+    from pure25519.ed25519_oop import SigningKey as Ed25519SigningKey
+    from pure25519.ed25519_oop import VerifyingKey as Ed25519VerifyingKey
+
+# X25519: the same arrangement. When `cryptography` is available, replace the
+# pure Python RNS module loaded above with OpenSSL-backed classes exposing its
+# API (from_private_bytes/generate/private_bytes/public_key/exchange and
+# from_public_bytes/public_bytes), so every handler picks it up unchanged.
+#
+# Three RNS quirks are preserved so results stay byte-identical: private keys
+# are stored clamped (private_bytes() returns the clamped scalar), peer public
+# keys are not masked to 255 bits, so the rare u-coordinate with the top bit
+# set is handed to the pure Python ladder instead of OpenSSL, and low-order
+# peer keys, which OpenSSL rejects, also go to the ladder and yield RNS's
+# all-zero shared secret.
+try:
+    from cryptography.hazmat.primitives.asymmetric import x25519 as _openssl_x25519
+
+    _rns_x25519 = X25519
+
+    def _x25519_check_length(data):
+        if len(data) != 32:
+            raise ValueError("Curve25519 values must be 32 bytes")
+
+    def _x25519_clamp(data):
+        _x25519_check_length(data)
+        clamped = bytearray(data)
+        clamped[0] &= 248
+        clamped[31] = (clamped[31] & 127) | 64
+        return bytes(clamped)
+
+    class _X25519PrivateKey:
+        def __init__(self, real):
+            self.real = real
+
+        @classmethod
+        def generate(cls):
+            return cls.from_private_bytes(os.urandom(32))
+
+        @classmethod
+        def from_private_bytes(cls, data):
+            return cls(_openssl_x25519.X25519PrivateKey.from_private_bytes(_x25519_clamp(data)))
+
+        def private_bytes(self):
+            return self.real.private_bytes(
+                encoding=_serialization.Encoding.Raw,
+                format=_serialization.PrivateFormat.Raw,
+                encryption_algorithm=_serialization.NoEncryption()
+            )
+
+        def public_key(self):
+            return _X25519PublicKey(self.real.public_key())
+
+        def exchange(self, peer_public_key):
+            if peer_public_key.real is not None:
+                try:
+                    return self.real.exchange(peer_public_key.real)
+                except ValueError:
+                    # OpenSSL refuses low-order points (all-zero shared secret);
+                    # RNS returns the zero secret, so use its ladder instead
+                    pass
+            prv = _rns_x25519.X25519PrivateKey.from_private_bytes(self.private_bytes())
+            return prv.exchange(_rns_x25519.X25519PublicKey.from_public_bytes(peer_public_key.public_bytes()))
+
+    class _X25519PublicKey:
+        def __init__(self, real, raw=None):
+            self.real = real
+            self.raw = raw
+
+        @classmethod
+        def from_public_bytes(cls, data):
+            _x25519_check_length(data)
+            if data[31] & 0x80:
+                return cls(None, bytes(data))
+            return cls(_openssl_x25519.X25519PublicKey.from_public_bytes(data))
+
+        def public_bytes(self):
+            if self.real is None:
+                return self.raw
+            return self.real.public_bytes(
+                encoding=_serialization.Encoding.Raw,
+                format=_serialization.PublicFormat.Raw
+            )
+
+    X25519 = type(sys)('X25519')
+    X25519.X25519PrivateKey = _X25519PrivateKey
+    X25519.X25519PublicKey = _X25519PublicKey
+
+except ImportError:
+    pass  # keep the pure Python RNS X25519 module
+
+
+
+# orjson is considerably faster than the stdlib json module for the request
+# and response lines; it is optional and the stdlib is used when missing.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data):
+    """Parse one JSON request line (str or bytes)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj):
+    """Serialize a response to UTF-8 JSON bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; let the stdlib handle it
+    return json.dumps(obj).encode('utf-8')
+
+
+# Alternatively, BRIDGE_TRANSPORT=msgpack exchanges MessagePack maps, each
+# preceded by its length as a 4-byte big-endian integer (after the READY
+# line). msgspec is used when installed, otherwise the umsgpack bundled
+# with RNS.
+TRANSPORT = os.environ.get('BRIDGE_TRANSPORT', 'json')
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+_FRAME_HEADER = struct.Struct(">I")
+
+
+def msgpack_loads(data):
+    """Parse one MessagePack request."""
+    if msgspec is not None:
+        return msgspec.msgpack.decode(data)
+    return umsgpack.unpackb(data)
+
 
+def msgpack_dumps(obj):
+    """Serialize a response to MessagePack bytes."""
+    if msgspec is not None:
+        return msgspec.msgpack.encode(obj)
+    return umsgpack.packb(obj)
 
 
-def hex_to_bytes(hex_str):
-    """Convert hex string to bytes."""
-    return bytes.fromhex(hex_str)
+def _read_lines(stream):
+    """Yield non-empty request lines."""
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def _read_frames(stream):
+    """Yield length-prefixed request payloads until EOF."""
+    while True:
+        header = stream.read(_FRAME_HEADER.size)
+        if len(header) < _FRAME_HEADER.size:
+            return
+        length, = _FRAME_HEADER.unpack(header)
+        payload = stream.read(length)
+        if len(payload) < length:
+            return
+        yield payload
+
+
+def _write_line(stream, payload):
+    stream.write(payload + b"\n")
+
+
+def _write_frame(stream, payload):
+    stream.write(_FRAME_HEADER.pack(len(payload)) + payload)
+
+
+# name: (read requests, write response, decode, encode, format name for errors)
+_TRANSPORTS = {
+    'json': (_read_lines, _write_line, json_loads, json_dumps, 'JSON'),
+    'msgpack': (_read_frames, _write_frame, msgpack_loads, msgpack_dumps, 'MessagePack'),
+}
+
+if TRANSPORT not in _TRANSPORTS:
+    raise SystemExit(f"Unsupported BRIDGE_TRANSPORT: {TRANSPORT}")
+
+_read_requests, _write_response, _decode_request, _encode_response, _TRANSPORT_FORMAT = _TRANSPORTS[TRANSPORT]
+
+if TRANSPORT == 'json':
+    _DECODE_ERRORS = (ValueError,)  # json/orjson JSONDecodeError
+elif msgspec is not None:
+    _DECODE_ERRORS = (msgspec.DecodeError,)
+else:
+    _DECODE_ERRORS = (umsgpack.UnpackException,)
+
+
+# Bound once at import; these are called on every hashing request
+_sha256 = hashlib.sha256
+_sha512 = hashlib.sha512
+
+
+def _sha256_parts(*parts):
+    """SHA-256 digest of the concatenated parts, without building the concatenation."""
+    h = _sha256()
+    for part in parts:
+        h.update(part)
+    return h.digest()
+
+
+# Byte fields are hex strings by default. Setting BRIDGE_BYTES_ENCODING=base64
+# switches every hex_to_bytes/bytes_to_hex field to base64, which is a third
+# smaller on the wire and decoded in C; both ends must agree on the setting.
+# With the msgpack transport the default is "raw": byte fields are carried
+# as msgpack bin values and need no conversion at all.
+BYTES_ENCODING = os.environ.get('BRIDGE_BYTES_ENCODING', 'raw' if TRANSPORT == 'msgpack' else 'hex')
+
+def _raw_to_bytes(value):
+    # str values are handler defaults such as '' (or hex sent by the client)
+    if isinstance(value, str):
+        return bytes.fromhex(value)
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    # bytes() of an int or list would quietly build the wrong bytes
+    raise TypeError(f"Expected a MessagePack bin value, got {type(value).__name__}")
+
+
+def _hex_to_bytes(value):
+    # a2b_hex decodes hex noticeably faster than bytes.fromhex, but is
+    # stricter; anything it rejects (e.g. whitespace) gets fromhex's
+    # leniency and its ValueError messages
+    try:
+        return binascii.a2b_hex(value)
+    except ValueError:
+        return bytes.fromhex(value)
+
+
+# For encoding, bytes.hex beats b2a_hex(...).decode() because it builds the
+# str directly.
+_BYTES_CODECS = {
+    'hex': (_hex_to_bytes, bytes.hex),
+    'base64': (binascii.a2b_base64, lambda data: binascii.b2a_base64(data, newline=False).decode('ascii')),
+    'raw': (_raw_to_bytes, lambda data: data),
+}
+
+if BYTES_ENCODING not in _BYTES_CODECS:
+    raise SystemExit(f"Unsupported BRIDGE_BYTES_ENCODING: {BYTES_ENCODING}")
+if BYTES_ENCODING == 'raw' and TRANSPORT != 'msgpack':
+    raise SystemExit("BRIDGE_BYTES_ENCODING=raw requires BRIDGE_TRANSPORT=msgpack")
+
+# Convert wire values (hex by default, see BYTES_ENCODING) to and from bytes.
+# Bound straight to the codec so hot handler fields skip a wrapper frame.
+hex_to_bytes, bytes_to_hex = _BYTES_CODECS[BYTES_ENCODING]
+
+
+def _fixed_to_bytes(value, size, name):
+    """hex_to_bytes() for a field that must be exactly size bytes.
+
+    A hex string of the wrong length is rejected before it is decoded, so an
+    oversized value is never materialised just to fail the check.
+    """
+    if BYTES_ENCODING == 'hex' and len(value) % 2 == 0 and len(value) != 2 * size:
+        raise ValueError(f"{name} must be {size} bytes, got {len(value) // 2}")
+    data = hex_to_bytes(value)
+    if len(data) != size:
+        raise ValueError(f"{name} must be {size} bytes, got {len(data)}")
+    return data
+
 
+try:
+    from cryptography.hazmat.primitives import hashes as _hashes
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF as _OpenSSLHKDF
+except ImportError:
+    _OpenSSLHKDF = None
 
-def bytes_to_hex(data):
-    """Convert bytes to hex string."""
-    return data.hex()
+
+def _hkdf(length=None, derive_from=None, salt=None, context=None):
+    """HKDF-SHA256 with RNS semantics, computed by OpenSSL when available."""
+    # RNS wraps the block counter past 255 blocks where OpenSSL refuses
+    if _OpenSSLHKDF is None or (length is not None and length > 255 * 32):
+        return HKDF.hkdf(length=length, derive_from=derive_from, salt=salt, context=context)
+
+    if length == None or length < 1: raise ValueError("Invalid output key length")
+    if derive_from == None or derive_from == "": raise ValueError("Cannot derive key from empty input material")
+
+    if salt == None or len(salt) == 0: salt = bytes(32)
+    return _OpenSSLHKDF(algorithm=_hashes.SHA256(), length=length, salt=salt, info=context).derive(derive_from)
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_token(key):
+    """Return a Token for key, reused across requests that share the key.
+
+    Token instances carry only the derived signing/encryption keys, so a
+    cached instance is safe to share between calls.
+    """
+    return Token.Token(key)
+
+
+@functools.lru_cache(maxsize=1024)
+def _signing_key(seed):
+    """Return an Ed25519SigningKey for seed, reused across requests."""
+    return Ed25519SigningKey(seed)
+
+
+@functools.lru_cache(maxsize=1024)
+def _verifying_key(public_key):
+    """Return an Ed25519VerifyingKey for public_key, reused across requests."""
+    return Ed25519VerifyingKey(public_key)
+
+
+@functools.lru_cache(maxsize=1024)
+def _x25519_private_key(private_key):
+    """Return an X25519PrivateKey for private_key, reused across requests."""
+    return X25519.X25519PrivateKey.from_private_bytes(private_key)
+
+
+@functools.lru_cache(maxsize=1024)
+def _x25519_public_bytes(private_key):
+    """Return the X25519 public key for private_key, derived once per key."""
+    return _x25519_private_key(private_key).public_key().public_bytes()
+
+
+@functools.lru_cache(maxsize=4096)
+def _identity_hash(public_key):
+    """Return the 16-byte identity hash of public_key, computed once per key."""
+    return _sha256(public_key).digest()[:16]
+
+
+@functools.lru_cache(maxsize=4096)
+def _ratchet_id(ratchet):
+    """Return the 10-byte ratchet ID of a ratchet public key, computed once per key."""
+    return _sha256(ratchet).digest()[:10]
+
+
+@functools.lru_cache(maxsize=1024)
+def _token_hmac(signing_key):
+    """Return an HMAC-SHA256 keyed with signing_key for callers to copy().
+
+    Copying skips re-deriving the inner/outer padded keys on every message.
+    """
+    return hmac.new(signing_key, digestmod='sha256')
+
+
+def _token_encrypt_with_iv(token_obj, plaintext, iv):
+    """Token.encrypt() with a caller-supplied IV, for reproducible output.
+
+    Produces iv + ciphertext + HMAC-SHA256(iv + ciphertext) in one join; the
+    HMAC is fed both parts incrementally rather than a concatenated copy.
+    """
+    ciphertext = token_obj.mode.encrypt(
+        plaintext=PKCS7.pad(plaintext),
+        key=token_obj._encryption_key,
+        iv=iv
+    )
+    mac = _token_hmac(token_obj._signing_key).copy()
+    mac.update(iv)
+    mac.update(ciphertext)
+    return b"".join((iv, ciphertext, mac.digest()))
+
+
+def _token_decrypt(token_obj, token, offset=0):
+    """Token.decrypt() reading the token through a memoryview.
+
+    The HMAC and (with OpenSSL AES) the cipher consume slices of the view, so
+    the token body is not copied twice before decryption. A token that
+    starts offset bytes into token (after an ephemeral public key) is read in
+    place. Errors match Token.decrypt().
+    """
+    if not isinstance(token, bytes): raise TypeError("Token must be bytes")
+    if len(token) - offset <= 32:
+        raise ValueError("Cannot verify HMAC on token of only "+str(len(token) - offset)+" bytes")
+
+    view = memoryview(token)[offset:]
+    mac = _token_hmac(token_obj._signing_key).copy()
+    mac.update(view[:-32])
+    if not hmac.compare_digest(view[-32:], mac.digest()):
+        raise ValueError("Token HMAC was invalid")
+
+    try:
+        return PKCS7.unpad(
+            token_obj.mode.decrypt(
+                ciphertext=view[16:-32] if _HAVE_CRYPTOGRAPHY_AES else token[offset+16:-32],
+                key=token_obj._encryption_key,
+                iv=token[offset:offset+16]))
+
+    except Exception as e: raise ValueError(f"Could not decrypt token: {e}")
 
 
 # Command handlers
@@ -183,21 +667,18 @@ def bytes_to_hex(data):
 def cmd_x25519_generate(params):
     """Generate X25519 keypair from seed."""
     seed = hex_to_bytes(params['seed'])
-    priv = X25519.X25519PrivateKey.from_private_bytes(seed)
-    pub = priv.public_key()
+    priv = _x25519_private_key(seed)
     return {
         'private_key': bytes_to_hex(priv.private_bytes()),
-        'public_key': bytes_to_hex(pub.public_bytes())
+        'public_key': bytes_to_hex(_x25519_public_bytes(seed))
     }
 
 
 def cmd_x25519_public_from_private(params):
     """Derive public key from private key."""
     private_key = hex_to_bytes(params['private_key'])
-    priv = X25519.X25519PrivateKey.from_private_bytes(private_key)
-    pub = priv.public_key()
     return {
-        'public_key': bytes_to_hex(pub.public_bytes())
+        'public_key': bytes_to_hex(_x25519_public_bytes(private_key))
     }
 
 
@@ -206,7 +687,7 @@ def cmd_x25519_exchange(params):
     private_key = hex_to_bytes(params['private_key'])
     peer_public_key = hex_to_bytes(params['peer_public_key'])
 
-    priv = X25519.X25519PrivateKey.from_private_bytes(private_key)
+    priv = _x25519_private_key(private_key)
     pub = X25519.X25519PublicKey.from_public_bytes(peer_public_key)
     shared = priv.exchange(pub)
 
@@ -219,9 +700,7 @@ def cmd_ed25519_generate(params):
     """Generate Ed25519 keypair from seed."""
     seed = hex_to_bytes(params['seed'])
 
-    # Use the pure25519 implementation (from Cryptography path)
-    from pure25519.ed25519_oop import SigningKey
-    sk = SigningKey(seed)
+    sk = _signing_key(seed)
 
     return {
         'private_key': bytes_to_hex(seed),
@@ -234,8 +713,7 @@ def cmd_ed25519_sign(params):
     private_key = hex_to_bytes(params['private_key'])
     message = hex_to_bytes(params['message'])
 
-    from pure25519.ed25519_oop import SigningKey
-    sk = SigningKey(private_key)
+    sk = _signing_key(private_key)
     signature = sk.sign(message)
 
     return {
@@ -249,9 +727,8 @@ def cmd_ed25519_verify(params):
     message = hex_to_bytes(params['message'])
     signature = hex_to_bytes(params['signature'])
 
-    from pure25519.ed25519_oop import VerifyingKey
     try:
-        vk = VerifyingKey(public_key)
+        vk = _verifying_key(public_key)
         vk.verify(signature, message)
         return {'valid': True}
     except Exception:
@@ -261,7 +738,7 @@ def cmd_ed25519_verify(params):
 def cmd_sha256(params):
     """Compute SHA-256 hash."""
     data = hex_to_bytes(params['data'])
-    hash_result = hashlib.sha256(data).digest()
+    hash_result = _sha256(data).digest()
     return {
         'hash': bytes_to_hex(hash_result)
     }
@@ -270,7 +747,7 @@ def cmd_sha256(params):
 def cmd_sha512(params):
     """Compute SHA-512 hash."""
     data = hex_to_bytes(params['data'])
-    hash_result = hashlib.sha512(data).digest()
+    hash_result = _sha512(data).digest()
     return {
         'hash': bytes_to_hex(hash_result)
     }
@@ -281,7 +758,7 @@ def cmd_hmac_sha256(params):
     key = hex_to_bytes(params['key'])
     data = hex_to_bytes(params['message'])
 
-    hmac_result = HMAC.new(key, data).digest()
+    hmac_result = hmac.digest(key, data, 'sha256')
     return {
         'hmac': bytes_to_hex(hmac_result)
     }
@@ -294,7 +771,7 @@ def cmd_hkdf(params):
     salt = hex_to_bytes(params['salt']) if params.get('salt') else None
     info = hex_to_bytes(params['info']) if params.get('info') else None
 
-    derived = HKDF.hkdf(length=length, derive_from=ikm, salt=salt, context=info)
+    derived = _hkdf(length=length, derive_from=ikm, salt=salt, context=info)
     return {
         'derived_key': bytes_to_hex(derived)
     }
@@ -363,20 +840,12 @@ def cmd_token_encrypt(params):
     plaintext = hex_to_bytes(params['plaintext'])
     iv = hex_to_bytes(params['iv']) if params.get('iv') else None
 
-    token_obj = Token.Token(key)
+    token_obj = _get_token(key)
 
     if iv:
         # For reproducibility, we need to manually construct the token
         # This matches the encrypt() method but with fixed IV
-        mode = token_obj.mode
-        ciphertext = mode.encrypt(
-            plaintext=PKCS7.pad(plaintext),
-            key=token_obj._encryption_key,
-            iv=iv
-        )
-        signed_parts = iv + ciphertext
-        hmac_val = HMAC.new(token_obj._signing_key, signed_parts).digest()
-        token_bytes = signed_parts + hmac_val
+        token_bytes = _token_encrypt_with_iv(token_obj, plaintext, iv)
     else:
         token_bytes = token_obj.encrypt(plaintext)
 
@@ -390,8 +859,8 @@ def cmd_token_decrypt(params):
     key = hex_to_bytes(params['key'])
     token_bytes = hex_to_bytes(params['token'])
 
-    token_obj = Token.Token(key)
-    plaintext = token_obj.decrypt(token_bytes)
+    token_obj = _get_token(key)
+    plaintext = _token_decrypt(token_obj, token_bytes)
 
     return {
         'plaintext': bytes_to_hex(plaintext)
@@ -403,8 +872,13 @@ def cmd_token_verify_hmac(params):
     key = hex_to_bytes(params['key'])
     token_bytes = hex_to_bytes(params['token'])
 
-    token_obj = Token.Token(key)
-    valid = token_obj.verify_hmac(token_bytes)
+    if len(token_bytes) <= 32:
+        raise ValueError("Cannot verify HMAC on token of only "+str(len(token_bytes))+" bytes")
+
+    # Same check as Token.verify_hmac, with OpenSSL's HMAC
+    mac = _token_hmac(_get_token(key)._signing_key).copy()
+    mac.update(token_bytes[:-32])
+    valid = hmac.compare_digest(token_bytes[-32:], mac.digest())
 
     return {
         'valid': valid
@@ -420,23 +894,21 @@ def cmd_identity_from_private_key(params):
     ed25519_prv_bytes = private_key[32:]
 
     # Derive public keys
-    x25519_prv = X25519.X25519PrivateKey.from_private_bytes(x25519_prv_bytes)
-    x25519_pub = x25519_prv.public_key()
-    x25519_pub_bytes = x25519_pub.public_bytes()
+    x25519_pub_bytes = _x25519_public_bytes(x25519_prv_bytes)
 
-    from pure25519.ed25519_oop import SigningKey
-    ed25519_sk = SigningKey(ed25519_prv_bytes)
+    ed25519_sk = _signing_key(ed25519_prv_bytes)
     ed25519_pub_bytes = ed25519_sk.vk_s
 
     # Full public key
     public_key = x25519_pub_bytes + ed25519_pub_bytes
 
     # Identity hash = truncated_hash(public_key)
-    identity_hash = hashlib.sha256(public_key).digest()[:16]
+    identity_hash = _identity_hash(public_key)
 
     return {
         'public_key': bytes_to_hex(public_key),
         'hash': bytes_to_hex(identity_hash),
+        # RNS's Identity.hexhash is always a hex string, whatever the byte codec
         'hexhash': identity_hash.hex()
     }
 
@@ -454,20 +926,23 @@ def cmd_identity_encrypt(params):
 
     # Generate or use provided ephemeral key
     if ephemeral_private:
-        ephemeral_prv = X25519.X25519PrivateKey.from_private_bytes(ephemeral_private)
+        ephemeral_prv = _x25519_private_key(ephemeral_private)
+        ephemeral_pub_bytes = _x25519_public_bytes(ephemeral_private)
     else:
         ephemeral_prv = X25519.X25519PrivateKey.generate()
-
-    ephemeral_pub_bytes = ephemeral_prv.public_key().public_bytes()
+        ephemeral_pub_bytes = ephemeral_prv.public_key().public_bytes()
 
     # ECDH exchange
     shared_key = ephemeral_prv.exchange(x25519_pub)
 
-    # Identity hash for salt
-    identity_hash = hashlib.sha256(public_key).digest()[:16]
+    # Identity hash for salt; callers that already know it may pass it in
+    if params.get('identity_hash'):
+        identity_hash = hex_to_bytes(params['identity_hash'])
+    else:
+        identity_hash = _identity_hash(public_key)
 
     # HKDF key derivation
-    derived_key = HKDF.hkdf(
+    derived_key = _hkdf(
         length=64,
         derive_from=shared_key,
         salt=identity_hash,
@@ -475,18 +950,11 @@ def cmd_identity_encrypt(params):
     )
 
     # Token encryption
-    token_obj = Token.Token(derived_key)
+    token_obj = _get_token(derived_key)
 
     if iv:
         # Use provided IV for reproducibility
-        ciphertext = token_obj.mode.encrypt(
-            plaintext=PKCS7.pad(plaintext),
-            key=token_obj._encryption_key,
-            iv=iv
-        )
-        signed_parts = iv + ciphertext
-        hmac_val = HMAC.new(token_obj._signing_key, signed_parts).digest()
-        token_bytes = signed_parts + hmac_val
+        token_bytes = _token_encrypt_with_iv(token_obj, plaintext, iv)
     else:
         token_bytes = token_obj.encrypt(plaintext)
 
@@ -509,23 +977,21 @@ def cmd_identity_decrypt(params):
 
     # Split private key: X25519 (32) + Ed25519 (32)
     x25519_prv_bytes = private_key[:32]
-    x25519_prv = X25519.X25519PrivateKey.from_private_bytes(x25519_prv_bytes)
+    x25519_prv = _x25519_private_key(x25519_prv_bytes)
 
     # Derive public key for identity hash
-    x25519_pub_bytes = x25519_prv.public_key().public_bytes()
+    x25519_pub_bytes = _x25519_public_bytes(x25519_prv_bytes)
 
     # Get Ed25519 public key too for full identity hash
     ed25519_prv_bytes = private_key[32:]
-    from pure25519.ed25519_oop import SigningKey
-    ed25519_sk = SigningKey(ed25519_prv_bytes)
+    ed25519_sk = _signing_key(ed25519_prv_bytes)
     ed25519_pub_bytes = ed25519_sk.vk_s
 
     full_public_key = x25519_pub_bytes + ed25519_pub_bytes
-    identity_hash = hashlib.sha256(full_public_key).digest()[:16]
+    identity_hash = _identity_hash(full_public_key)
 
-    # Extract ephemeral public key and token
+    # Extract ephemeral public key; the token after it is decrypted in place
     peer_pub_bytes = ciphertext[:32]
-    token_bytes = ciphertext[32:]
 
     peer_pub = X25519.X25519PublicKey.from_public_bytes(peer_pub_bytes)
 
@@ -533,7 +999,7 @@ def cmd_identity_decrypt(params):
     shared_key = x25519_prv.exchange(peer_pub)
 
     # HKDF key derivation
-    derived_key = HKDF.hkdf(
+    derived_key = _hkdf(
         length=64,
         derive_from=shared_key,
         salt=identity_hash,
@@ -541,8 +1007,8 @@ def cmd_identity_decrypt(params):
     )
 
     # Token decryption
-    token_obj = Token.Token(derived_key)
-    plaintext = token_obj.decrypt(token_bytes)
+    token_obj = _get_token(derived_key)
+    plaintext = _token_decrypt(token_obj, ciphertext, 32)
 
     return {
         'plaintext': bytes_to_hex(plaintext),
@@ -559,8 +1025,7 @@ def cmd_identity_sign(params):
     # Ed25519 private key is second 32 bytes
     ed25519_prv_bytes = private_key[32:]
 
-    from pure25519.ed25519_oop import SigningKey
-    sk = SigningKey(ed25519_prv_bytes)
+    sk = _signing_key(ed25519_prv_bytes)
     signature = sk.sign(message)
 
     return {
@@ -577,9 +1042,8 @@ def cmd_identity_verify(params):
     # Ed25519 public key is second 32 bytes
     ed25519_pub_bytes = public_key[32:]
 
-    from pure25519.ed25519_oop import VerifyingKey
     try:
-        vk = VerifyingKey(ed25519_pub_bytes)
+        vk = _verifying_key(ed25519_pub_bytes)
         vk.verify(signature, message)
         return {'valid': True}
     except Exception:
@@ -591,7 +1055,7 @@ def cmd_identity_hash(params):
     public_key = hex_to_bytes(params['public_key'])
 
     # Identity hash is truncated_hash(public_key) = SHA256[0:16]
-    full_hash = hashlib.sha256(public_key).digest()
+    full_hash = _sha256(public_key).digest()
     truncated = full_hash[:16]
 
     return {
@@ -619,11 +1083,12 @@ def cmd_destination_hash(params):
     full_name = ".".join(name_parts)
 
     # Name hash = SHA256(name.encode())[0:10]
-    name_hash = hashlib.sha256(full_name.encode('utf-8')).digest()[:10]
+    name_hash = _sha256(full_name.encode('utf-8')).digest()[:10]
 
     # Destination hash = SHA256(name_hash + identity_hash)[0:16]
-    addr_hash_material = name_hash + identity_hash
-    dest_hash = hashlib.sha256(addr_hash_material).digest()[:16]
+    addr_hasher = _sha256(name_hash)
+    addr_hasher.update(identity_hash)
+    dest_hash = addr_hasher.digest()[:16]
 
     return {
         'name_hash': bytes_to_hex(name_hash),
@@ -635,7 +1100,7 @@ def cmd_destination_hash(params):
 def cmd_truncated_hash(params):
     """Compute truncated hash (first 16 bytes of SHA256)."""
     data = hex_to_bytes(params['data'])
-    full_hash = hashlib.sha256(data).digest()
+    full_hash = _sha256(data).digest()
     truncated = full_hash[:16]
 
     return {
@@ -647,7 +1112,7 @@ def cmd_truncated_hash(params):
 def cmd_name_hash(params):
     """Compute name hash (first 10 bytes of SHA256)."""
     name = params['name']
-    full_hash = hashlib.sha256(name.encode('utf-8')).digest()
+    full_hash = _sha256(name.encode('utf-8')).digest()
     name_hash = full_hash[:10]
 
     return {
@@ -655,6 +1120,39 @@ def cmd_name_hash(params):
     }
 
 
+DST_LEN = 16  # TRUNCATED_HASHLENGTH // 8
+
+# flags, hops, [transport_id,] destination_hash, context
+_PACKET_HEADER_1 = struct.Struct(f"!BB{DST_LEN}sB")
+_PACKET_HEADER_2 = struct.Struct(f"!BB{DST_LEN}s{DST_LEN}sB")
+
+
+def _decode_flags(flags):
+    """Split a flags byte into (header_type, context_flag, transport_type, destination_type, packet_type)."""
+    return (
+        (flags & 0b01000000) >> 6,
+        (flags & 0b00100000) >> 5,
+        (flags & 0b00010000) >> 4,
+        (flags & 0b00001100) >> 2,
+        (flags & 0b00000011)
+    )
+
+# Every flags byte decoded up front, and the reverse mapping for encoding
+_FLAGS_DECODE = [_decode_flags(flags) for flags in range(256)]
+_FLAGS_ENCODE = {fields: flags for flags, fields in enumerate(_FLAGS_DECODE[:0x80])}
+# Flags byte with only the lower 4 bits kept, as used in packet hashes
+_FLAGS_HASHABLE = [bytes([flags & 0b00001111]) for flags in range(256)]
+
+
+def _encode_flags(header_type, context_flag, transport_type, destination_type, packet_type):
+    """Combine flag fields into a flags byte."""
+    flags = _FLAGS_ENCODE.get((header_type, context_flag, transport_type, destination_type, packet_type))
+    if flags is None:
+        # Out-of-range field values: keep the plain bitwise combination
+        flags = (header_type << 6) | (context_flag << 5) | (transport_type << 4) | (destination_type << 2) | packet_type
+    return flags
+
+
 def cmd_packet_flags(params):
     """Compute packet flags byte from components."""
     header_type = int(params['header_type'])
@@ -663,7 +1161,7 @@ def cmd_packet_flags(params):
     destination_type = int(params['destination_type'])
     packet_type = int(params['packet_type'])
 
-    flags = (header_type << 6) | (context_flag << 5) | (transport_type << 4) | (destination_type << 2) | packet_type
+    flags = _encode_flags(header_type, context_flag, transport_type, destination_type, packet_type)
 
     return {
         'flags': flags,
@@ -675,11 +1173,7 @@ def cmd_packet_parse_flags(params):
     """Parse packet flags byte into components."""
     flags = int(params['flags'])
 
-    header_type = (flags & 0b01000000) >> 6
-    context_flag = (flags & 0b00100000) >> 5
-    transport_type = (flags & 0b00010000) >> 4
-    destination_type = (flags & 0b00001100) >> 2
-    packet_type = (flags & 0b00000011)
+    header_type, context_flag, transport_type, destination_type, packet_type = _FLAGS_DECODE[flags & 0xFF]
 
     return {
         'header_type': header_type,
@@ -692,8 +1186,6 @@ def cmd_packet_parse_flags(params):
 
 def cmd_packet_pack(params):
     """Pack a packet into raw bytes."""
-    import struct
-
     header_type = int(params['header_type'])
     context_flag = int(params['context_flag'])
     transport_type = int(params['transport_type'])
@@ -706,19 +1198,16 @@ def cmd_packet_pack(params):
     data = hex_to_bytes(params['data'])
 
     # Compute flags
-    flags = (header_type << 6) | (context_flag << 5) | (transport_type << 4) | (destination_type << 2) | packet_type
-
-    # Build header
-    header = struct.pack("!B", flags) + struct.pack("!B", hops)
+    flags = _encode_flags(header_type, context_flag, transport_type, destination_type, packet_type)
 
+    # Build header. Hashes are joined as given rather than packed into the
+    # fixed-width structs, which would silently pad or truncate them
     if header_type == 1:  # HEADER_2
         if transport_id is None:
             raise ValueError("HEADER_2 requires transport_id")
-        header += transport_id + destination_hash
+        header = b"".join((bytes((flags, hops)), transport_id, destination_hash, bytes((context,))))
     else:  # HEADER_1
-        header += destination_hash
-
-    header += bytes([context])
+        header = b"".join((bytes((flags, hops)), destination_hash, bytes((context,))))
 
     raw = header + data
 
@@ -732,28 +1221,25 @@ def cmd_packet_pack(params):
 def cmd_packet_unpack(params):
     """Unpack raw packet bytes into components."""
     raw = hex_to_bytes(params['raw'])
+    if len(raw) < 2:
+        raise ValueError(f"Packet too short: {len(raw)} bytes, need at least 2 for flags and hops")
 
     flags = raw[0]
     hops = raw[1]
 
-    header_type = (flags & 0b01000000) >> 6
-    context_flag = (flags & 0b00100000) >> 5
-    transport_type = (flags & 0b00010000) >> 4
-    destination_type = (flags & 0b00001100) >> 2
-    packet_type = (flags & 0b00000011)
+    header_type, context_flag, transport_type, destination_type, packet_type = _FLAGS_DECODE[flags]
 
-    DST_LEN = 16  # TRUNCATED_HASHLENGTH // 8
+    header_size = _PACKET_HEADER_2.size if header_type == 1 else _PACKET_HEADER_1.size
+    if len(raw) < header_size:
+        raise ValueError(f"Packet too short: {len(raw)} bytes, HEADER_{header_type + 1} needs {header_size}")
 
     if header_type == 1:  # HEADER_2
-        transport_id = raw[2:2+DST_LEN]
-        destination_hash = raw[2+DST_LEN:2+2*DST_LEN]
-        context = raw[2+2*DST_LEN]
-        data = raw[3+2*DST_LEN:]
+        _, _, transport_id, destination_hash, context = _PACKET_HEADER_2.unpack_from(raw)
+        data = raw[_PACKET_HEADER_2.size:]
     else:  # HEADER_1
         transport_id = None
-        destination_hash = raw[2:2+DST_LEN]
-        context = raw[2+DST_LEN]
-        data = raw[3+DST_LEN:]
+        _, _, destination_hash, context = _PACKET_HEADER_1.unpack_from(raw)
+        data = raw[_PACKET_HEADER_1.size:]
 
     return {
         'flags': flags,
@@ -775,20 +1261,21 @@ def cmd_packet_hash(params):
     raw = hex_to_bytes(params['raw'])
 
     flags = raw[0]
-    header_type = (flags & 0b01000000) >> 6
-
-    DST_LEN = 16
+    header_type = _FLAGS_DECODE[flags][0]
 
     # Mask flags to only keep lower 4 bits
-    masked_flags = bytes([flags & 0b00001111])
+    masked_flags = _FLAGS_HASHABLE[flags]
 
     if header_type == 1:  # HEADER_2
         # Skip transport_id (16 bytes after hops)
-        hashable_part = masked_flags + raw[2+DST_LEN:]
+        start = 2+DST_LEN
     else:  # HEADER_1
-        hashable_part = masked_flags + raw[2:]
+        start = 2
 
-    full_hash = hashlib.sha256(hashable_part).digest()
+    # Joining a memoryview slice copies the packet body once, not twice
+    hashable_part = b"".join((masked_flags, memoryview(raw)[start:]))
+
+    full_hash = _sha256(hashable_part).digest()
     truncated = full_hash[:16]
 
     return {
@@ -803,13 +1290,30 @@ HDLC_FLAG = 0x7E
 HDLC_ESC = 0x7D
 HDLC_ESC_MASK = 0x20
 
+# Escape sequences built once. Two C-level bytes.replace() passes (escape
+# byte first, so its output is never re-escaped) measured faster than any
+# single-pass Python-level alternative (per-byte table join, re.sub).
+_HDLC_FLAG_BYTE = bytes([HDLC_FLAG])
+_HDLC_ESC_BYTE = bytes([HDLC_ESC])
+_HDLC_ESCAPED_FLAG = bytes([HDLC_ESC, HDLC_FLAG ^ HDLC_ESC_MASK])
+_HDLC_ESCAPED_ESC = bytes([HDLC_ESC, HDLC_ESC ^ HDLC_ESC_MASK])
+
+
+def _hdlc_escape(data):
+    return data.replace(_HDLC_ESC_BYTE, _HDLC_ESCAPED_ESC).replace(_HDLC_FLAG_BYTE, _HDLC_ESCAPED_FLAG)
+
+
+def _hdlc_unescape(data):
+    # Same order as RNS's interfaces: an escaped flag can never be mistaken
+    # for the tail of an escaped escape byte
+    return data.replace(_HDLC_ESCAPED_FLAG, _HDLC_FLAG_BYTE).replace(_HDLC_ESCAPED_ESC, _HDLC_ESC_BYTE)
+
 
 def cmd_hdlc_escape(params):
     """Escape data for HDLC framing."""
     data = hex_to_bytes(params['data'])
 
-    escaped = data.replace(bytes([HDLC_ESC]), bytes([HDLC_ESC, HDLC_ESC ^ HDLC_ESC_MASK]))
-    escaped = escaped.replace(bytes([HDLC_FLAG]), bytes([HDLC_ESC, HDLC_FLAG ^ HDLC_ESC_MASK]))
+    escaped = _hdlc_escape(data)
 
     return {
         'escaped': bytes_to_hex(escaped)
@@ -820,10 +1324,9 @@ def cmd_hdlc_frame(params):
     """Frame data with HDLC framing."""
     data = hex_to_bytes(params['data'])
 
-    escaped = data.replace(bytes([HDLC_ESC]), bytes([HDLC_ESC, HDLC_ESC ^ HDLC_ESC_MASK]))
-    escaped = escaped.replace(bytes([HDLC_FLAG]), bytes([HDLC_ESC, HDLC_FLAG ^ HDLC_ESC_MASK]))
+    escaped = _hdlc_escape(data)
 
-    framed = bytes([HDLC_FLAG]) + escaped + bytes([HDLC_FLAG])
+    framed = b"".join((_HDLC_FLAG_BYTE, escaped, _HDLC_FLAG_BYTE))
 
     return {
         'framed': bytes_to_hex(framed),
@@ -838,13 +1341,21 @@ KISS_TFEND = 0xDC
 KISS_TFESC = 0xDD
 KISS_CMD_DATA = 0x00
 
+_KISS_FEND_BYTE = bytes([KISS_FEND])
+_KISS_FESC_BYTE = bytes([KISS_FESC])
+_KISS_ESCAPED_FEND = bytes([KISS_FESC, KISS_TFEND])
+_KISS_ESCAPED_FESC = bytes([KISS_FESC, KISS_TFESC])
+
+
+def _kiss_escape(data):
+    return data.replace(_KISS_FESC_BYTE, _KISS_ESCAPED_FESC).replace(_KISS_FEND_BYTE, _KISS_ESCAPED_FEND)
+
 
 def cmd_kiss_escape(params):
     """Escape data for KISS framing."""
     data = hex_to_bytes(params['data'])
 
-    escaped = data.replace(bytes([KISS_FESC]), bytes([KISS_FESC, KISS_TFESC]))
-    escaped = escaped.replace(bytes([KISS_FEND]), bytes([KISS_FESC, KISS_TFEND]))
+    escaped = _kiss_escape(data)
 
     return {
         'escaped': bytes_to_hex(escaped)
@@ -856,10 +1367,9 @@ def cmd_kiss_frame(params):
     data = hex_to_bytes(params['data'])
     command = int(params.get('command', KISS_CMD_DATA))
 
-    escaped = data.replace(bytes([KISS_FESC]), bytes([KISS_FESC, KISS_TFESC]))
-    escaped = escaped.replace(bytes([KISS_FEND]), bytes([KISS_FESC, KISS_TFEND]))
+    escaped = _kiss_escape(data)
 
-    framed = bytes([KISS_FEND, command]) + escaped + bytes([KISS_FEND])
+    framed = b"".join((bytes([KISS_FEND, command]), escaped, _KISS_FEND_BYTE))
 
     return {
         'framed': bytes_to_hex(framed),
@@ -879,35 +1389,27 @@ def cmd_link_id_from_packet(params):
     raw = hex_to_bytes(params['raw'])
 
     flags = raw[0]
-    header_type = (flags & 0b01000000) >> 6
+    header_type = _FLAGS_DECODE[flags][0]
 
-    DST_LEN = 16
     ECPUBSIZE = 64  # X25519 (32) + Ed25519 (32) public keys
 
     # Mask flags to only keep lower 4 bits
-    masked_flags = bytes([flags & 0b00001111])
+    masked_flags = _FLAGS_HASHABLE[flags]
 
     if header_type == 1:  # HEADER_2
-        hashable_part = masked_flags + raw[2+DST_LEN:]
+        start = 2+DST_LEN
+        header_len = 2 + DST_LEN + DST_LEN + 1  # flags + hops + transport_id + dest + context
     else:  # HEADER_1
-        hashable_part = masked_flags + raw[2:]
+        start = 2
+        header_len = 2 + DST_LEN + 1  # flags + hops + dest + context
 
     # For link requests, if data is longer than ECPUBSIZE,
     # exclude the extra bytes (MTU signalling) from hash
-    # Parse to find data portion
-    if header_type == 1:
-        header_len = 2 + DST_LEN + DST_LEN + 1  # flags + hops + transport_id + dest + context
-    else:
-        header_len = 2 + DST_LEN + 1  # flags + hops + dest + context
+    end = min(len(raw), header_len + ECPUBSIZE)
 
-    data_start = header_len
-    data = raw[data_start:]
+    hashable_part = b"".join((masked_flags, memoryview(raw)[start:end]))
 
-    if len(data) > ECPUBSIZE:
-        diff = len(data) - ECPUBSIZE
-        hashable_part = hashable_part[:-diff]
-
-    full_hash = hashlib.sha256(hashable_part).digest()
+    full_hash = _sha256(hashable_part).digest()
     link_id = full_hash[:16]
 
     return {
@@ -941,7 +1443,7 @@ def cmd_link_derive_key(params):
     else:
         length = 32
 
-    derived = HKDF.hkdf(
+    derived = _hkdf(
         length=length,
         derive_from=shared_key,
         salt=salt,
@@ -961,18 +1463,11 @@ def cmd_link_encrypt(params):
     plaintext = hex_to_bytes(params['plaintext'])
     iv = hex_to_bytes(params['iv']) if params.get('iv') else None
 
-    token_obj = Token.Token(derived_key)
+    token_obj = _get_token(derived_key)
 
     if iv:
         # Use provided IV for reproducibility
-        ciphertext = token_obj.mode.encrypt(
-            plaintext=PKCS7.pad(plaintext),
-            key=token_obj._encryption_key,
-            iv=iv
-        )
-        signed_parts = iv + ciphertext
-        hmac_val = HMAC.new(token_obj._signing_key, signed_parts).digest()
-        token_bytes = signed_parts + hmac_val
+        token_bytes = _token_encrypt_with_iv(token_obj, plaintext, iv)
     else:
         token_bytes = token_obj.encrypt(plaintext)
 
@@ -986,8 +1481,8 @@ def cmd_link_decrypt(params):
     derived_key = hex_to_bytes(params['derived_key'])
     ciphertext = hex_to_bytes(params['ciphertext'])
 
-    token_obj = Token.Token(derived_key)
-    plaintext = token_obj.decrypt(ciphertext)
+    token_obj = _get_token(derived_key)
+    plaintext = _token_decrypt(token_obj, ciphertext)
 
     return {
         'plaintext': bytes_to_hex(plaintext)
@@ -1006,13 +1501,12 @@ def cmd_link_prove(params):
     signalling_bytes = hex_to_bytes(params.get('signalling_bytes', ''))
 
     # Build signed data
-    signed_data = link_id + receiver_pub + receiver_sig_pub + signalling_bytes
+    signed_data = b"".join((link_id, receiver_pub, receiver_sig_pub, signalling_bytes))
 
     # Sign with Ed25519 private key (second 32 bytes of identity)
     ed25519_prv = identity_private[32:64]
 
-    from pure25519.ed25519_oop import SigningKey
-    sk = SigningKey(ed25519_prv)
+    sk = _signing_key(ed25519_prv)
     signature = sk.sign(signed_data)
 
     return {
@@ -1031,14 +1525,13 @@ def cmd_link_verify_proof(params):
     signature = hex_to_bytes(params['signature'])
 
     # Build signed data
-    signed_data = link_id + receiver_pub + receiver_sig_pub + signalling_bytes
+    signed_data = b"".join((link_id, receiver_pub, receiver_sig_pub, signalling_bytes))
 
     # Verify with Ed25519 public key (second 32 bytes of identity)
     ed25519_pub = identity_public[32:64]
 
-    from pure25519.ed25519_oop import VerifyingKey
     try:
-        vk = VerifyingKey(ed25519_pub)
+        vk = _verifying_key(ed25519_pub)
         vk.verify(signature, signed_data)
         return {'valid': True}
     except Exception:
@@ -1060,11 +1553,7 @@ def cmd_link_signalling_bytes(params):
 
     value = (mtu & MTU_BYTEMASK) + (((mode << 5) & MODE_BYTEMASK) << 16)
 
-    signalling = bytes([
-        (value >> 16) & 0xFF,
-        (value >> 8) & 0xFF,
-        value & 0xFF
-    ])
+    signalling = value.to_bytes(3, 'big')
 
     return {
         'signalling_bytes': bytes_to_hex(signalling),
@@ -1083,9 +1572,9 @@ def cmd_link_parse_signalling(params):
     MTU_BYTEMASK = 0x1FFFFF
     MODE_BYTEMASK = 0xE0
 
-    value = (signalling[0] << 16) | (signalling[1] << 8) | signalling[2]
+    value = int.from_bytes(signalling, 'big')
     mtu = value & MTU_BYTEMASK
-    mode = (signalling[0] & MODE_BYTEMASK) >> 5
+    mode = (value >> 16 & MODE_BYTEMASK) >> 5
 
     return {
         'mtu': mtu,
@@ -1095,13 +1584,24 @@ def cmd_link_parse_signalling(params):
 
 # Announce operations
 
+# Field offsets in announce data:
+#   public_key (64) + name_hash (10) + random_hash (10) [+ ratchet (32)] + signature (64) + app_data
+_ANNOUNCE_NAME_HASH = 64
+_ANNOUNCE_RANDOM_HASH = _ANNOUNCE_NAME_HASH + 10
+_ANNOUNCE_RATCHET = _ANNOUNCE_RANDOM_HASH + 10
+_ANNOUNCE_SIGNATURE = _ANNOUNCE_RATCHET
+_ANNOUNCE_SIGNATURE_RATCHET = _ANNOUNCE_RATCHET + 32
+# app_data offsets, which are also the minimum announce sizes
+_ANNOUNCE_APP_DATA = _ANNOUNCE_SIGNATURE + 64
+_ANNOUNCE_APP_DATA_RATCHET = _ANNOUNCE_SIGNATURE_RATCHET + 64
+
+
 def cmd_random_hash(params):
     """Generate random_hash (5 random bytes + 5 timestamp bytes).
 
     Format matches Python RNS:
     random_hash = RNS.Identity.get_random_hash()[0:5]+int(time.time()).to_bytes(5, "big")
     """
-    import time
     timestamp = params.get('timestamp')
     random_bytes = hex_to_bytes(params['random_bytes']) if params.get('random_bytes') else None
 
@@ -1118,13 +1618,14 @@ def cmd_random_hash(params):
         timestamp = int(time.time())
 
     # Combine: 5 random bytes + 5 timestamp bytes (big-endian)
-    random_hash = random_bytes + timestamp.to_bytes(5, "big")
+    timestamp_bytes = timestamp.to_bytes(5, "big")
+    random_hash = random_bytes + timestamp_bytes
 
     return {
         'random_hash': bytes_to_hex(random_hash),
         'random_bytes': bytes_to_hex(random_bytes),
         'timestamp': timestamp,
-        'timestamp_bytes': bytes_to_hex(timestamp.to_bytes(5, "big"))
+        'timestamp_bytes': bytes_to_hex(timestamp_bytes)
     }
 
 
@@ -1137,27 +1638,16 @@ def cmd_announce_pack(params):
     With ratchet (180 bytes min):
       public_key (64) + name_hash (10) + random_hash (10) + ratchet (32) + signature (64) + app_data (var)
     """
-    public_key = hex_to_bytes(params['public_key'])
-    name_hash = hex_to_bytes(params['name_hash'])
-    random_hash = hex_to_bytes(params['random_hash'])
-    ratchet = hex_to_bytes(params['ratchet']) if params.get('ratchet') else b""
-    signature = hex_to_bytes(params['signature'])
+    # Fixed-size fields are validated as they are decoded
+    public_key = _fixed_to_bytes(params['public_key'], 64, 'public_key')
+    name_hash = _fixed_to_bytes(params['name_hash'], 10, 'name_hash')
+    random_hash = _fixed_to_bytes(params['random_hash'], 10, 'random_hash')
+    ratchet = _fixed_to_bytes(params['ratchet'], 32, 'ratchet') if params.get('ratchet') else b""
+    signature = _fixed_to_bytes(params['signature'], 64, 'signature')
     app_data = hex_to_bytes(params['app_data']) if params.get('app_data') else b""
 
-    # Validate sizes
-    if len(public_key) != 64:
-        raise ValueError(f"public_key must be 64 bytes, got {len(public_key)}")
-    if len(name_hash) != 10:
-        raise ValueError(f"name_hash must be 10 bytes, got {len(name_hash)}")
-    if len(random_hash) != 10:
-        raise ValueError(f"random_hash must be 10 bytes, got {len(random_hash)}")
-    if ratchet and len(ratchet) != 32:
-        raise ValueError(f"ratchet must be 32 bytes, got {len(ratchet)}")
-    if len(signature) != 64:
-        raise ValueError(f"signature must be 64 bytes, got {len(signature)}")
-
     # Pack announce data
-    announce_data = public_key + name_hash + random_hash + ratchet + signature + app_data
+    announce_data = b"".join((public_key, name_hash, random_hash, ratchet, signature, app_data))
 
     return {
         'announce_data': bytes_to_hex(announce_data),
@@ -1174,442 +1664,134 @@ def cmd_announce_unpack(params):
     announce_data = hex_to_bytes(params['announce_data'])
     has_ratchet = params.get('has_ratchet', False)
 
-    # Constants
-    KEYSIZE = 64
-    NAME_HASH_LEN = 10
-    RANDOM_HASH_LEN = 10
-    RATCHET_SIZE = 32
-    SIG_LEN = 64
-
     # Unpack based on whether ratchet is present
     if has_ratchet:
-        if len(announce_data) < KEYSIZE + NAME_HASH_LEN + RANDOM_HASH_LEN + RATCHET_SIZE + SIG_LEN:
+        if len(announce_data) < _ANNOUNCE_APP_DATA_RATCHET:
             raise ValueError(f"announce_data too short for ratchet announce: {len(announce_data)} bytes")
 
-        public_key = announce_data[0:KEYSIZE]
-        name_hash = announce_data[KEYSIZE:KEYSIZE+NAME_HASH_LEN]
-        random_hash = announce_data[KEYSIZE+NAME_HASH_LEN:KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN]
-        ratchet = announce_data[KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN:KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN+RATCHET_SIZE]
-        signature = announce_data[KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN+RATCHET_SIZE:KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN+RATCHET_SIZE+SIG_LEN]
-        app_data = announce_data[KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN+RATCHET_SIZE+SIG_LEN:]
-    else:
-        if len(announce_data) < KEYSIZE + NAME_HASH_LEN + RANDOM_HASH_LEN + SIG_LEN:
-            raise ValueError(f"announce_data too short for non-ratchet announce: {len(announce_data)} bytes")
-
-        public_key = announce_data[0:KEYSIZE]
-        name_hash = announce_data[KEYSIZE:KEYSIZE+NAME_HASH_LEN]
-        random_hash = announce_data[KEYSIZE+NAME_HASH_LEN:KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN]
-        ratchet = b""
-        signature = announce_data[KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN:KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN+SIG_LEN]
-        app_data = announce_data[KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN+SIG_LEN:]
-
-    return {
-        'public_key': bytes_to_hex(public_key),
-        'name_hash': bytes_to_hex(name_hash),
-        'random_hash': bytes_to_hex(random_hash),
-        'ratchet': bytes_to_hex(ratchet) if ratchet else '',
-        'signature': bytes_to_hex(signature),
-        'app_data': bytes_to_hex(app_data) if app_data else '',
-        'has_ratchet': len(ratchet) > 0
-    }
-
-
-def cmd_announce_sign(params):
-    """Sign announce data.
-
-    Signed data format:
-      destination_hash + public_key + name_hash + random_hash + ratchet + app_data
-    """
-    private_key = hex_to_bytes(params['private_key'])
-    destination_hash = hex_to_bytes(params['destination_hash'])
-    public_key = hex_to_bytes(params['public_key'])
-    name_hash = hex_to_bytes(params['name_hash'])
-    random_hash = hex_to_bytes(params['random_hash'])
-    ratchet = hex_to_bytes(params['ratchet']) if params.get('ratchet') else b""
-    app_data = hex_to_bytes(params['app_data']) if params.get('app_data') else b""
-
-    # Build signed data (matches Python RNS Destination.announce())
-    signed_data = destination_hash + public_key + name_hash + random_hash + ratchet + app_data
-
-    # Sign with Ed25519 private key (second 32 bytes)
-    ed25519_prv = private_key[32:64]
-
-    from pure25519.ed25519_oop import SigningKey
-    sk = SigningKey(ed25519_prv)
-    signature = sk.sign(signed_data)
-
-    return {
-        'signature': bytes_to_hex(signature),
-        'signed_data': bytes_to_hex(signed_data)
-    }
-
-
-def cmd_announce_verify(params):
-    """Verify announce signature.
-
-    Validates signature and optionally validates destination hash.
-    """
-    announce_data = hex_to_bytes(params['announce_data'])
-    destination_hash = hex_to_bytes(params['destination_hash'])
-    has_ratchet = params.get('has_ratchet', False)
-    validate_dest_hash = params.get('validate_dest_hash', True)
-
-    # Constants
-    KEYSIZE = 64
-    NAME_HASH_LEN = 10
-    RANDOM_HASH_LEN = 10
-    RATCHET_SIZE = 32
-    SIG_LEN = 64
-
-    # Unpack announce data
-    if has_ratchet:
-        public_key = announce_data[0:KEYSIZE]
-        name_hash = announce_data[KEYSIZE:KEYSIZE+NAME_HASH_LEN]
-        random_hash = announce_data[KEYSIZE+NAME_HASH_LEN:KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN]
-        ratchet = announce_data[KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN:KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN+RATCHET_SIZE]
-        signature = announce_data[KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN+RATCHET_SIZE:KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN+RATCHET_SIZE+SIG_LEN]
-        app_data = announce_data[KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN+RATCHET_SIZE+SIG_LEN:]
-    else:
-        public_key = announce_data[0:KEYSIZE]
-        name_hash = announce_data[KEYSIZE:KEYSIZE+NAME_HASH_LEN]
-        random_hash = announce_data[KEYSIZE+NAME_HASH_LEN:KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN]
-        ratchet = b""
-        signature = announce_data[KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN:KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN+SIG_LEN]
-        app_data = announce_data[KEYSIZE+NAME_HASH_LEN+RANDOM_HASH_LEN+SIG_LEN:]
-
-    # Build signed data
-    signed_data = destination_hash + public_key + name_hash + random_hash + ratchet + app_data
-
-    # Verify signature
-    ed25519_pub = public_key[32:64]
-
-    from pure25519.ed25519_oop import VerifyingKey
-    try:
-        vk = VerifyingKey(ed25519_pub)
-        vk.verify(signature, signed_data)
-        signature_valid = True
-    except Exception:
-        signature_valid = False
-
-    # Optionally validate destination hash
-    dest_hash_valid = True
-    expected_dest_hash = b""
-    if validate_dest_hash:
-        # Compute identity hash from public key
-        identity_hash = hashlib.sha256(public_key).digest()[:16]
-
-        # Compute expected destination hash
-        hash_material = name_hash + identity_hash
-        expected_dest_hash = hashlib.sha256(hash_material).digest()[:16]
-
-        dest_hash_valid = (destination_hash == expected_dest_hash)
-
-    return {
-        'valid': signature_valid and dest_hash_valid,
-        'signature_valid': signature_valid,
-        'dest_hash_valid': dest_hash_valid,
-        'expected_dest_hash': bytes_to_hex(expected_dest_hash) if validate_dest_hash else ''
-    }
-
-
-# Ratchet operations
-
-def cmd_ratchet_id(params):
-    """Compute ratchet ID from ratchet public key.
-
-    Ratchet ID = SHA256(ratchet_public_bytes)[:10]
-    """
-    ratchet_public = hex_to_bytes(params['ratchet_public'])
-
-    # Compute full hash
-    full_hash = hashlib.sha256(ratchet_public).digest()
-
-    # Truncate to NAME_HASH_LENGTH (80 bits = 10 bytes)
-    ratchet_id = full_hash[:10]
-
-    return {
-        'ratchet_id': bytes_to_hex(ratchet_id),
-        'full_hash': bytes_to_hex(full_hash)
-    }
-
-
-def cmd_ratchet_public_from_private(params):
-    """Derive public key from ratchet private key."""
-    ratchet_private = hex_to_bytes(params['ratchet_private'])
-
-    # Create X25519 key pair from private key
-    ratchet_prv = X25519.X25519PrivateKey.from_private_bytes(ratchet_private)
-    ratchet_pub = ratchet_prv.public_key()
-    ratchet_pub_bytes = ratchet_pub.public_bytes()
-
-    return {
-        'ratchet_public': bytes_to_hex(ratchet_pub_bytes)
-    }
-
-
-def cmd_ratchet_derive_key(params):
-    """Derive encryption key using ratchet.
-
-    This performs ECDH with ephemeral key and ratchet public key,
-    then derives a key using HKDF with identity hash as salt.
-    """
-    ephemeral_private = hex_to_bytes(params['ephemeral_private'])
-    ratchet_public = hex_to_bytes(params['ratchet_public'])
-    identity_hash = hex_to_bytes(params['identity_hash'])
-
-    # Create keys
-    ephemeral_prv = X25519.X25519PrivateKey.from_private_bytes(ephemeral_private)
-    ratchet_pub = X25519.X25519PublicKey.from_public_bytes(ratchet_public)
-
-    # ECDH exchange
-    shared_key = ephemeral_prv.exchange(ratchet_pub)
-
-    # HKDF key derivation with identity hash as salt
-    derived_key = HKDF.hkdf(
-        length=64,
-        derive_from=shared_key,
-        salt=identity_hash,
-        context=None
-    )
-
-    return {
-        'shared_key': bytes_to_hex(shared_key),
-        'derived_key': bytes_to_hex(derived_key)
-    }
-
-
-def cmd_ratchet_encrypt(params):
-    """Encrypt plaintext using ratchet.
-
-    Same as identity_encrypt but uses ratchet public key instead of identity public key.
-    """
-    ratchet_public = hex_to_bytes(params['ratchet_public'])
-    plaintext = hex_to_bytes(params['plaintext'])
-    identity_hash = hex_to_bytes(params['identity_hash'])
-    ephemeral_private = hex_to_bytes(params['ephemeral_private']) if params.get('ephemeral_private') else None
-    iv = hex_to_bytes(params['iv']) if params.get('iv') else None
-
-    # Create ratchet public key
-    ratchet_pub = X25519.X25519PublicKey.from_public_bytes(ratchet_public)
-
-    # Generate or use provided ephemeral key
-    if ephemeral_private:
-        ephemeral_prv = X25519.X25519PrivateKey.from_private_bytes(ephemeral_private)
-    else:
-        ephemeral_prv = X25519.X25519PrivateKey.generate()
-
-    ephemeral_pub_bytes = ephemeral_prv.public_key().public_bytes()
-
-    # ECDH exchange with ratchet
-    shared_key = ephemeral_prv.exchange(ratchet_pub)
-
-    # HKDF key derivation with identity hash as salt
-    derived_key = HKDF.hkdf(
-        length=64,
-        derive_from=shared_key,
-        salt=identity_hash,
-        context=None
-    )
-
-    # Token encryption
-    token_obj = Token.Token(derived_key)
-
-    if iv:
-        # Use provided IV for reproducibility
-        ciphertext = token_obj.mode.encrypt(
-            plaintext=PKCS7.pad(plaintext),
-            key=token_obj._encryption_key,
-            iv=iv
-        )
-        signed_parts = iv + ciphertext
-        hmac_val = HMAC.new(token_obj._signing_key, signed_parts).digest()
-        token_bytes = signed_parts + hmac_val
-    else:
-        token_bytes = token_obj.encrypt(plaintext)
-
-    # Return ephemeral_pub + token
-    result = ephemeral_pub_bytes + token_bytes
-
-    return {
-        'ciphertext': bytes_to_hex(result),
-        'ephemeral_public': bytes_to_hex(ephemeral_pub_bytes),
-        'shared_key': bytes_to_hex(shared_key),
-        'derived_key': bytes_to_hex(derived_key)
-    }
-
-
-def cmd_ratchet_decrypt(params):
-    """Decrypt ciphertext using ratchet.
-
-    Tries to decrypt using provided ratchet private keys.
-    """
-    ratchet_private = hex_to_bytes(params['ratchet_private'])
-    ciphertext = hex_to_bytes(params['ciphertext'])
-    identity_hash = hex_to_bytes(params['identity_hash'])
-
-    # Extract ephemeral public key (first 32 bytes)
-    if len(ciphertext) <= 32:
-        return {
-            'success': False,
-            'plaintext': None,
-            'error': 'Ciphertext too short'
-        }
-
-    ephemeral_pub_bytes = ciphertext[:32]
-    token_data = ciphertext[32:]
-
-    # Create keys
-    ratchet_prv = X25519.X25519PrivateKey.from_private_bytes(ratchet_private)
-    ephemeral_pub = X25519.X25519PublicKey.from_public_bytes(ephemeral_pub_bytes)
-
-    # ECDH exchange
-    shared_key = ratchet_prv.exchange(ephemeral_pub)
-
-    # HKDF key derivation with identity hash as salt
-    derived_key = HKDF.hkdf(
-        length=64,
-        derive_from=shared_key,
-        salt=identity_hash,
-        context=None
-    )
+        ratchet = announce_data[_ANNOUNCE_RATCHET:_ANNOUNCE_SIGNATURE_RATCHET]
+        signature = announce_data[_ANNOUNCE_SIGNATURE_RATCHET:_ANNOUNCE_APP_DATA_RATCHET]
+        app_data = announce_data[_ANNOUNCE_APP_DATA_RATCHET:]
+    else:
+        if len(announce_data) < _ANNOUNCE_APP_DATA:
+            raise ValueError(f"announce_data too short for non-ratchet announce: {len(announce_data)} bytes")
 
-    # Token decryption
-    try:
-        token_obj = Token.Token(derived_key)
-        plaintext = token_obj.decrypt(token_data)
+        ratchet = b""
+        signature = announce_data[_ANNOUNCE_SIGNATURE:_ANNOUNCE_APP_DATA]
+        app_data = announce_data[_ANNOUNCE_APP_DATA:]
 
-        if plaintext is None:
-            return {
-                'success': False,
-                'plaintext': None,
-                'shared_key': bytes_to_hex(shared_key),
-                'derived_key': bytes_to_hex(derived_key)
-            }
+    public_key = announce_data[0:_ANNOUNCE_NAME_HASH]
+    name_hash = announce_data[_ANNOUNCE_NAME_HASH:_ANNOUNCE_RANDOM_HASH]
+    random_hash = announce_data[_ANNOUNCE_RANDOM_HASH:_ANNOUNCE_RATCHET]
 
-        return {
-            'success': True,
-            'plaintext': bytes_to_hex(plaintext),
-            'shared_key': bytes_to_hex(shared_key),
-            'derived_key': bytes_to_hex(derived_key)
-        }
-    except Exception as e:
-        return {
-            'success': False,
-            'plaintext': None,
-            'error': str(e),
-            'shared_key': bytes_to_hex(shared_key),
-            'derived_key': bytes_to_hex(derived_key)
-        }
+    return {
+        'public_key': bytes_to_hex(public_key),
+        'name_hash': bytes_to_hex(name_hash),
+        'random_hash': bytes_to_hex(random_hash),
+        'ratchet': bytes_to_hex(ratchet) if ratchet else '',
+        'signature': bytes_to_hex(signature),
+        'app_data': bytes_to_hex(app_data) if app_data else '',
+        'has_ratchet': len(ratchet) > 0
+    }
 
 
-def cmd_ratchet_storage_format(params):
-    """Pack ratchet storage format using msgpack.
+def cmd_announce_sign(params):
+    """Sign announce data.
 
-    Format: {"ratchet": ratchet_bytes, "received": timestamp}
+    Signed data format:
+      destination_hash + public_key + name_hash + random_hash + ratchet + app_data
     """
-    import time
+    private_key = hex_to_bytes(params['private_key'])
+    destination_hash = hex_to_bytes(params['destination_hash'])
+    public_key = hex_to_bytes(params['public_key'])
+    name_hash = hex_to_bytes(params['name_hash'])
+    random_hash = hex_to_bytes(params['random_hash'])
+    ratchet = hex_to_bytes(params['ratchet']) if params.get('ratchet') else b""
+    app_data = hex_to_bytes(params['app_data']) if params.get('app_data') else b""
 
-    ratchet = hex_to_bytes(params['ratchet'])
-    received = float(params.get('received', time.time()))
+    # Build signed data (matches Python RNS Destination.announce())
+    signed_data = b"".join((destination_hash, public_key, name_hash, random_hash, ratchet, app_data))
 
-    # Pack using msgpack
-    ratchet_data = {
-        "ratchet": ratchet,
-        "received": received
-    }
+    # Sign with Ed25519 private key (second 32 bytes)
+    ed25519_prv = private_key[32:64]
 
-    packed = umsgpack.packb(ratchet_data)
+    sk = _signing_key(ed25519_prv)
+    signature = sk.sign(signed_data)
 
     return {
-        'packed': bytes_to_hex(packed),
-        'ratchet': bytes_to_hex(ratchet),
-        'received': received
+        'signature': bytes_to_hex(signature),
+        'signed_data': bytes_to_hex(signed_data)
     }
 
 
-def cmd_ratchet_extract_from_announce(params):
-    """Extract ratchet from announce data.
+def cmd_announce_verify(params):
+    """Verify announce signature.
 
-    Announce format: public_key(64) + name_hash(10) + random_hash(10) + ratchet(32) + signature(64) [+ app_data]
+    Validates signature and optionally validates destination hash. With
+    fail_fast set, an announce whose destination hash does not match is
+    rejected without checking the signature (signature_valid is None).
     """
     announce_data = hex_to_bytes(params['announce_data'])
+    destination_hash = hex_to_bytes(params['destination_hash'])
+    has_ratchet = params.get('has_ratchet', False)
+    validate_dest_hash = params.get('validate_dest_hash', True)
+    fail_fast = params.get('fail_fast', False)
 
-    # Parse announce structure
-    # public_key: 64 bytes
-    # name_hash: 10 bytes
-    # random_hash: 10 bytes
-    # ratchet: 32 bytes (or 0 if not present)
-    # signature: 64 bytes
-
-    if len(announce_data) < 64 + 10 + 10 + 64:
-        return {
-            'has_ratchet': False,
-            'ratchet': None,
-            'error': 'Announce too short'
-        }
-
-    offset = 0
-    public_key = announce_data[offset:offset+64]
-    offset += 64
+    # Unpack announce data
+    if has_ratchet:
+        sig_start = _ANNOUNCE_SIGNATURE_RATCHET
+        sig_end = _ANNOUNCE_APP_DATA_RATCHET
+    else:
+        sig_start = _ANNOUNCE_SIGNATURE
+        sig_end = _ANNOUNCE_APP_DATA
 
-    name_hash = announce_data[offset:offset+10]
-    offset += 10
+    public_key = announce_data[0:_ANNOUNCE_NAME_HASH]
+    name_hash = announce_data[_ANNOUNCE_NAME_HASH:_ANNOUNCE_RANDOM_HASH]
+    signature = announce_data[sig_start:sig_end]
 
-    random_hash = announce_data[offset:offset+10]
-    offset += 10
+    # Optionally validate destination hash; it is far cheaper than the
+    # signature check, so it goes first
+    dest_hash_valid = True
+    expected_dest_hash = b""
+    if validate_dest_hash:
+        # Compute identity hash from public key
+        identity_hash = _identity_hash(public_key)
 
-    # Check if there's space for ratchet + signature
-    remaining = len(announce_data) - offset
+        # Compute expected destination hash
+        hash_material = name_hash + identity_hash
+        expected_dest_hash = _sha256(hash_material).digest()[:16]
 
-    if remaining >= 32 + 64:
-        # Ratchet is present
-        ratchet = announce_data[offset:offset+32]
-        offset += 32
-        signature = announce_data[offset:offset+64]
-        offset += 64
+        dest_hash_valid = (destination_hash == expected_dest_hash)
 
-        # Check if ratchet is all zeros (no ratchet)
-        if ratchet == b'\x00' * 32:
-            has_ratchet = False
-            ratchet = None
-        else:
-            has_ratchet = True
-    elif remaining == 64:
-        # No ratchet, just signature
-        has_ratchet = False
-        ratchet = None
-        signature = announce_data[offset:offset+64]
-        offset += 64
-    else:
+    if fail_fast and not dest_hash_valid:
         return {
-            'has_ratchet': False,
-            'ratchet': None,
-            'error': 'Invalid announce structure'
+            'valid': False,
+            'signature_valid': None,
+            'dest_hash_valid': False,
+            'expected_dest_hash': bytes_to_hex(expected_dest_hash)
         }
 
-    # Any remaining data is app_data
-    app_data = announce_data[offset:] if offset < len(announce_data) else b''
+    # Build signed data: public_key, name_hash, random_hash and ratchet are
+    # contiguous in the announce, as is app_data after the signature
+    signed_data = b"".join((destination_hash, announce_data[:sig_start], announce_data[sig_end:]))
 
-    result = {
-        'has_ratchet': has_ratchet,
-        'public_key': bytes_to_hex(public_key),
-        'name_hash': bytes_to_hex(name_hash),
-        'random_hash': bytes_to_hex(random_hash),
-        'signature': bytes_to_hex(signature)
-    }
+    # Verify signature
+    ed25519_pub = public_key[32:64]
 
-    if has_ratchet:
-        result['ratchet'] = bytes_to_hex(ratchet)
-        # Compute ratchet ID
-        ratchet_id = hashlib.sha256(ratchet).digest()[:10]
-        result['ratchet_id'] = bytes_to_hex(ratchet_id)
-    else:
-        result['ratchet'] = None
+    try:
+        vk = _verifying_key(ed25519_pub)
+        vk.verify(signature, signed_data)
+        signature_valid = True
+    except Exception:
+        signature_valid = False
 
-    if app_data:
-        result['app_data'] = bytes_to_hex(app_data)
+    return {
+        'valid': signature_valid and dest_hash_valid,
+        'signature_valid': signature_valid,
+        'dest_hash_valid': dest_hash_valid,
+        'expected_dest_hash': bytes_to_hex(expected_dest_hash) if validate_dest_hash else ''
+    }
 
-    return result
 
 # Ratchet operations
 
@@ -1637,9 +1819,7 @@ def cmd_ratchet_public_from_private(params):
     ratchet_private = hex_to_bytes(params['ratchet_private'])
 
     # Create X25519 key pair from private key
-    ratchet_prv = X25519.X25519PrivateKey.from_private_bytes(ratchet_private)
-    ratchet_pub = ratchet_prv.public_key()
-    ratchet_pub_bytes = ratchet_pub.public_bytes()
+    ratchet_pub_bytes = _x25519_public_bytes(ratchet_private)
 
     return {
         'ratchet_public': bytes_to_hex(ratchet_pub_bytes)
@@ -1657,14 +1837,14 @@ def cmd_ratchet_derive_key(params):
     identity_hash = hex_to_bytes(params['identity_hash'])
 
     # Create keys
-    ephemeral_prv = X25519.X25519PrivateKey.from_private_bytes(ephemeral_private)
+    ephemeral_prv = _x25519_private_key(ephemeral_private)
     ratchet_pub = X25519.X25519PublicKey.from_public_bytes(ratchet_public)
 
     # ECDH exchange
     shared_key = ephemeral_prv.exchange(ratchet_pub)
 
     # HKDF key derivation with identity hash as salt
-    derived_key = HKDF.hkdf(
+    derived_key = _hkdf(
         length=64,
         derive_from=shared_key,
         salt=identity_hash,
@@ -1693,17 +1873,17 @@ def cmd_ratchet_encrypt(params):
 
     # Generate or use provided ephemeral key
     if ephemeral_private:
-        ephemeral_prv = X25519.X25519PrivateKey.from_private_bytes(ephemeral_private)
+        ephemeral_prv = _x25519_private_key(ephemeral_private)
+        ephemeral_pub_bytes = _x25519_public_bytes(ephemeral_private)
     else:
         ephemeral_prv = X25519.X25519PrivateKey.generate()
-
-    ephemeral_pub_bytes = ephemeral_prv.public_key().public_bytes()
+        ephemeral_pub_bytes = ephemeral_prv.public_key().public_bytes()
 
     # ECDH exchange with ratchet
     shared_key = ephemeral_prv.exchange(ratchet_pub)
 
     # HKDF key derivation with identity hash as salt
-    derived_key = HKDF.hkdf(
+    derived_key = _hkdf(
         length=64,
         derive_from=shared_key,
         salt=identity_hash,
@@ -1711,18 +1891,11 @@ def cmd_ratchet_encrypt(params):
     )
 
     # Token encryption
-    token_obj = Token.Token(derived_key)
+    token_obj = _get_token(derived_key)
 
     if iv:
         # Use provided IV for reproducibility
-        ciphertext = token_obj.mode.encrypt(
-            plaintext=PKCS7.pad(plaintext),
-            key=token_obj._encryption_key,
-            iv=iv
-        )
-        signed_parts = iv + ciphertext
-        hmac_val = HMAC.new(token_obj._signing_key, signed_parts).digest()
-        token_bytes = signed_parts + hmac_val
+        token_bytes = _token_encrypt_with_iv(token_obj, plaintext, iv)
     else:
         token_bytes = token_obj.encrypt(plaintext)
 
@@ -1754,18 +1927,18 @@ def cmd_ratchet_decrypt(params):
             'error': 'Ciphertext too short'
         }
 
+    # The token follows the ephemeral key and is decrypted in place
     ephemeral_pub_bytes = ciphertext[:32]
-    token_data = ciphertext[32:]
 
     # Create keys
-    ratchet_prv = X25519.X25519PrivateKey.from_private_bytes(ratchet_private)
+    ratchet_prv = _x25519_private_key(ratchet_private)
     ephemeral_pub = X25519.X25519PublicKey.from_public_bytes(ephemeral_pub_bytes)
 
     # ECDH exchange
     shared_key = ratchet_prv.exchange(ephemeral_pub)
 
     # HKDF key derivation with identity hash as salt
-    derived_key = HKDF.hkdf(
+    derived_key = _hkdf(
         length=64,
         derive_from=shared_key,
         salt=identity_hash,
@@ -1774,8 +1947,8 @@ def cmd_ratchet_decrypt(params):
 
     # Token decryption
     try:
-        token_obj = Token.Token(derived_key)
-        plaintext = token_obj.decrypt(token_data)
+        token_obj = _get_token(derived_key)
+        plaintext = _token_decrypt(token_obj, ciphertext, 32)
 
         if plaintext is None:
             return {
@@ -1806,8 +1979,6 @@ def cmd_ratchet_storage_format(params):
 
     Format: {"ratchet": ratchet_bytes, "received": timestamp}
     """
-    import time
-
     ratchet = hex_to_bytes(params['ratchet'])
     received = float(params.get('received', time.time()))
 
@@ -1900,7 +2071,7 @@ def cmd_ratchet_extract_from_announce(params):
     if has_ratchet:
         result['ratchet'] = bytes_to_hex(ratchet)
         # Compute ratchet ID
-        ratchet_id = hashlib.sha256(ratchet).digest()[:10]
+        ratchet_id = _ratchet_id(ratchet)
         result['ratchet_id'] = bytes_to_hex(ratchet_id)
     else:
         result['ratchet'] = None
@@ -1930,9 +2101,8 @@ def cmd_ratchet_file_write(params):
     signing_key_bytes = hex_to_bytes(params['signing_private_key'])
 
     # Ed25519 private key is the second 32 bytes of the 64-byte identity key
-    from pure25519.ed25519_oop import SigningKey
     ed25519_seed = signing_key_bytes[32:]
-    sk = SigningKey(ed25519_seed)
+    sk = _signing_key(ed25519_seed)
 
     # Pack ratchets list (inner packing)
     packed_ratchets = umsgpack.packb(ratchet_keys)
@@ -1979,8 +2149,6 @@ def cmd_ratchet_file_read(params):
     path = params['path']
     verify_key_bytes = hex_to_bytes(params['verify_public_key'])
 
-    from pure25519.ed25519_oop import VerifyingKey
-
     with open(path, "rb") as f:
         file_data = f.read()
 
@@ -2000,7 +2168,7 @@ def cmd_ratchet_file_read(params):
     packed_ratchets = persisted_data["ratchets"]
 
     # Verify signature (VerifyingKey.verify raises on invalid)
-    vk = VerifyingKey(verify_key_bytes)
+    vk = _verifying_key(verify_key_bytes)
     try:
         vk.verify(signature, packed_ratchets)
         signature_valid = True
@@ -2020,21 +2188,25 @@ def cmd_ratchet_file_read(params):
 
 # Channel operations
 
+# msgtype, sequence, length
+_ENVELOPE_HEADER = struct.Struct(">HHH")
+# EOF flag, compressed flag, stream_id
+_STREAM_MSG_HEADER = struct.Struct(">H")
+
+
 def cmd_envelope_pack(params):
     """Pack a channel envelope.
 
     Format: [msgtype:2][sequence:2][length:2][data:N]
     All fields are big-endian.
     """
-    import struct
-
     msgtype = int(params['msgtype'])
     sequence = int(params['sequence'])
     data = hex_to_bytes(params['data'])
     length = len(data)
 
     # Pack header: msgtype (2), sequence (2), length (2)
-    header = struct.pack(">HHH", msgtype, sequence, length)
+    header = _ENVELOPE_HEADER.pack(msgtype, sequence, length)
     envelope = header + data
 
     return {
@@ -2050,15 +2222,13 @@ def cmd_envelope_unpack(params):
 
     Extracts msgtype, sequence, length, and data from envelope bytes.
     """
-    import struct
-
     envelope = hex_to_bytes(params['envelope'])
 
     if len(envelope) < 6:
         raise ValueError(f"Envelope too short: {len(envelope)} bytes")
 
     # Unpack header
-    msgtype, sequence, length = struct.unpack(">HHH", envelope[:6])
+    msgtype, sequence, length = _ENVELOPE_HEADER.unpack_from(envelope)
     data = envelope[6:]
 
     return {
@@ -2078,8 +2248,6 @@ def cmd_stream_msg_pack(params):
       Bit 14: compressed flag (0x4000)
       Bits 13-0: stream_id (0-16383)
     """
-    import struct
-
     stream_id = int(params['stream_id'])
     data = hex_to_bytes(params.get('data', ''))
     eof = bool(params.get('eof', False))
@@ -2097,7 +2265,7 @@ def cmd_stream_msg_pack(params):
         header_val |= 0x4000
 
     # Pack as big-endian 2-byte header
-    header = struct.pack(">H", header_val)
+    header = _STREAM_MSG_HEADER.pack(header_val)
     message = header + data
 
     return {
@@ -2114,15 +2282,13 @@ def cmd_stream_msg_unpack(params):
 
     Extracts stream_id, flags, and data from message bytes.
     """
-    import struct
-
     message = hex_to_bytes(params['message'])
 
     if len(message) < 2:
         raise ValueError(f"Message too short: {len(message)} bytes")
 
     # Unpack header
-    header_val = struct.unpack(">H", message[:2])[0]
+    header_val = _STREAM_MSG_HEADER.unpack_from(message)[0]
 
     # Extract fields
     stream_id = header_val & 0x3FFF
@@ -2141,13 +2307,17 @@ def cmd_stream_msg_unpack(params):
 
 # Link request/response operations
 
+# umsgpack packs every Python float as a msgpack float 64: 0xcb + big-endian double
+_MSGPACK_FLOAT64 = struct.Struct(">Bd")
+
+
 def cmd_link_rtt_pack(params):
     """Pack RTT value for link using umsgpack.
 
     Format: umsgpack.packb(rtt_float)
     """
     rtt = float(params['rtt'])
-    packed = umsgpack.packb(rtt)
+    packed = _MSGPACK_FLOAT64.pack(0xCB, rtt)
 
     return {
         'packed': bytes_to_hex(packed)
@@ -2157,7 +2327,10 @@ def cmd_link_rtt_pack(params):
 def cmd_link_rtt_unpack(params):
     """Unpack RTT value from msgpack bytes."""
     packed = hex_to_bytes(params['packed'])
-    rtt = umsgpack.unpackb(packed)
+    if len(packed) == _MSGPACK_FLOAT64.size and packed[0] == 0xCB:
+        rtt = _MSGPACK_FLOAT64.unpack(packed)[1]
+    else:
+        rtt = umsgpack.unpackb(packed)
 
     return {
         'rtt': rtt
@@ -2404,6 +2577,17 @@ def cmd_packet_hashlist_unpack(params):
 
 # Resource operations
 
+# Resource flag names, lowest bit first
+_RESOURCE_FLAG_NAMES = ('encrypted', 'compressed', 'split', 'is_request', 'is_response', 'has_metadata')
+
+# Every combination of the six flag bits decoded up front, and the reverse mapping for encoding
+_RESOURCE_FLAGS_DECODE = [
+    {name: (flags >> bit) & 0x01 == 0x01 for bit, name in enumerate(_RESOURCE_FLAG_NAMES)}
+    for flags in range(0x40)
+]
+_RESOURCE_FLAGS_ENCODE = {tuple(fields.values()): flags for flags, fields in enumerate(_RESOURCE_FLAGS_DECODE)}
+
+
 def cmd_resource_adv_pack(params):
     """Pack a ResourceAdvertisement to msgpack bytes."""
     transfer_size = int(params['transfer_size'])
@@ -2425,12 +2609,9 @@ def cmd_resource_adv_pack(params):
     hashmap_start = segment * HASHMAP_MAX_LEN
     hashmap_end = min((segment + 1) * HASHMAP_MAX_LEN, num_parts)
 
-    hashmap_slice = b""
-    for i in range(hashmap_start, hashmap_end):
-        start_byte = i * MAPHASH_LEN
-        end_byte = (i + 1) * MAPHASH_LEN
-        if end_byte <= len(hashmap):
-            hashmap_slice += hashmap[start_byte:end_byte]
+    # Only whole map hashes present in the supplied hashmap are included
+    hashmap_end = min(hashmap_end, len(hashmap) // MAPHASH_LEN)
+    hashmap_slice = hashmap[hashmap_start * MAPHASH_LEN:hashmap_end * MAPHASH_LEN]
 
     dictionary = {
         "t": transfer_size,
@@ -2460,12 +2641,6 @@ def cmd_resource_adv_unpack(params):
     dictionary = umsgpack.unpackb(packed)
 
     flags = dictionary["f"]
-    encrypted = (flags & 0x01) == 0x01
-    compressed = ((flags >> 1) & 0x01) == 0x01
-    split = ((flags >> 2) & 0x01) == 0x01
-    is_request = ((flags >> 3) & 0x01) == 0x01
-    is_response = ((flags >> 4) & 0x01) == 0x01
-    has_metadata = ((flags >> 5) & 0x01) == 0x01
 
     return {
         'transfer_size': dictionary["t"],
@@ -2479,12 +2654,7 @@ def cmd_resource_adv_unpack(params):
         'request_id': bytes_to_hex(dictionary["q"]) if dictionary["q"] is not None else None,
         'flags': flags,
         'hashmap': bytes_to_hex(dictionary["m"]),
-        'encrypted': encrypted,
-        'compressed': compressed,
-        'split': split,
-        'is_request': is_request,
-        'is_response': is_response,
-        'has_metadata': has_metadata
+        **_RESOURCE_FLAGS_DECODE[flags & 0x3F]
     }
 
 
@@ -2493,8 +2663,7 @@ def cmd_resource_hash(params):
     data = hex_to_bytes(params['data'])
     random_hash = hex_to_bytes(params['random_hash'])
 
-    hash_material = random_hash + data
-    full_hash = hashlib.sha256(hash_material).digest()
+    full_hash = _sha256_parts(random_hash, data)
     truncated = full_hash[:16]
 
     return {
@@ -2508,34 +2677,14 @@ def cmd_resource_flags(params):
     mode = params.get('mode', 'encode')
 
     if mode == 'encode':
-        encrypted = bool(params.get('encrypted', False))
-        compressed = bool(params.get('compressed', False))
-        split = bool(params.get('split', False))
-        is_request = bool(params.get('is_request', False))
-        is_response = bool(params.get('is_response', False))
-        has_metadata = bool(params.get('has_metadata', False))
-
-        flags = 0x00
-        if encrypted: flags |= 0x01
-        if compressed: flags |= 0x02
-        if split: flags |= 0x04
-        if is_request: flags |= 0x08
-        if is_response: flags |= 0x10
-        if has_metadata: flags |= 0x20
+        flags = _RESOURCE_FLAGS_ENCODE[tuple(bool(params.get(name, False)) for name in _RESOURCE_FLAG_NAMES)]
 
         return {
             'flags': flags
         }
     else:
         flags = int(params['flags'])
-        return {
-            'encrypted': (flags & 0x01) == 0x01,
-            'compressed': ((flags >> 1) & 0x01) == 0x01,
-            'split': ((flags >> 2) & 0x01) == 0x01,
-            'is_request': ((flags >> 3) & 0x01) == 0x01,
-            'is_response': ((flags >> 4) & 0x01) == 0x01,
-            'has_metadata': ((flags >> 5) & 0x01) == 0x01
-        }
+        return dict(_RESOURCE_FLAGS_DECODE[flags & 0x3F])
 
 
 def cmd_hashmap_pack(params):
@@ -2550,11 +2699,8 @@ def cmd_hashmap_pack(params):
     else:
         part_data_list = [hex_to_bytes(parts)]
 
-    hashmap = b""
-    for i in range(start_index, min(start_index + count, len(part_data_list))):
-        part_data = part_data_list[i]
-        part_hash = hashlib.sha256(part_data).digest()[:4]
-        hashmap += part_hash
+    end_index = min(start_index + count, len(part_data_list))
+    hashmap = b"".join([_sha256(part_data_list[i]).digest()[:4] for i in range(start_index, end_index)])
 
     return {
         'hashmap': bytes_to_hex(hashmap),
@@ -2571,8 +2717,7 @@ def cmd_resource_map_hash(params):
     part_data = hex_to_bytes(params['part_data'])
     random_hash = hex_to_bytes(params['random_hash'])
 
-    hash_material = part_data + random_hash
-    map_hash = hashlib.sha256(hash_material).digest()[:4]
+    map_hash = _sha256_parts(part_data, random_hash)[:4]
 
     return {
         'map_hash': bytes_to_hex(map_hash)
@@ -2590,11 +2735,9 @@ def cmd_resource_build_hashmap(params):
 
     part_data_list = [hex_to_bytes(p) for p in parts]
 
-    hashmap = b""
-    for part_data in part_data_list:
-        hash_material = part_data + random_hash
-        map_hash = hashlib.sha256(hash_material).digest()[:4]
-        hashmap += map_hash
+    # Join once instead of growing the hashmap bytes part by part, and emit a
+    # single hex string for the whole map rather than one per part hash.
+    hashmap = b"".join([_sha256(part_data + random_hash).digest()[:4] for part_data in part_data_list])
 
     return {
         'hashmap': bytes_to_hex(hashmap),
@@ -2611,8 +2754,7 @@ def cmd_resource_proof(params):
     data = hex_to_bytes(params['data'])
     resource_hash = hex_to_bytes(params['resource_hash'])
 
-    hash_material = data + resource_hash
-    proof = hashlib.sha256(hash_material).digest()[:16]
+    proof = _sha256_parts(data, resource_hash)[:16]
 
     return {
         'proof': bytes_to_hex(proof)
@@ -2631,9 +2773,12 @@ def cmd_resource_find_part(params):
     if len(map_hash) != 4:
         return {'index': -1, 'found': False, 'error': 'map_hash must be 4 bytes'}
 
-    for i in range(0, len(hashmap), 4):
-        if hashmap[i:i+4] == map_hash:
-            return {'index': i // 4, 'found': True}
+    # Let bytes.find do the scan, skipping any hit that straddles two entries
+    index = hashmap.find(map_hash)
+    while index > 0 and index % 4:
+        index = hashmap.find(map_hash, index + 1)
+    if index >= 0:
+        return {'index': index // 4, 'found': True}
 
     return {'index': -1, 'found': False}
 
@@ -2650,7 +2795,7 @@ def cmd_ifac_derive_key(params):
     ifac_origin = hex_to_bytes(params['ifac_origin'])
 
     # Derive 64-byte key using HKDF (matches RNS interface authentication)
-    ifac_key = HKDF.hkdf(length=64, derive_from=ifac_origin, salt=IFAC_SALT, context=None)
+    ifac_key = _hkdf(length=64, derive_from=ifac_origin, salt=IFAC_SALT, context=None)
 
     return {
         'ifac_key': bytes_to_hex(ifac_key),
@@ -2664,15 +2809,13 @@ def cmd_ifac_compute(params):
     IFAC = last N bytes of Ed25519 signature of packet data.
     The 64-byte ifac_key contains: bytes 0-31 = X25519 key, bytes 32-63 = Ed25519 signing key
     """
-    from pure25519.ed25519_oop import SigningKey
-
     ifac_key = hex_to_bytes(params['ifac_key'])
     packet_data = hex_to_bytes(params['packet_data'])
     ifac_size = int(params.get('ifac_size', 16))
 
     # Ed25519 signing key is the second half (bytes 32-63)
     ed25519_key = ifac_key[32:]
-    sk = SigningKey(ed25519_key)
+    sk = _signing_key(ed25519_key)
 
     # Sign the packet data
     signature = sk.sign(packet_data)
@@ -2692,8 +2835,6 @@ def cmd_ifac_verify(params):
     Recomputes IFAC and compares.
     The 64-byte ifac_key contains: bytes 0-31 = X25519 key, bytes 32-63 = Ed25519 signing key
     """
-    from pure25519.ed25519_oop import SigningKey
-
     ifac_key = hex_to_bytes(params['ifac_key'])
     packet_data = hex_to_bytes(params['packet_data'])
     expected_ifac = hex_to_bytes(params['expected_ifac'])
@@ -2701,7 +2842,7 @@ def cmd_ifac_verify(params):
 
     # Ed25519 signing key is the second half (bytes 32-63)
     ed25519_key = ifac_key[32:]
-    sk = SigningKey(ed25519_key)
+    sk = _signing_key(ed25519_key)
 
     # Sign the packet data
     signature = sk.sign(packet_data)
@@ -2721,8 +2862,6 @@ def cmd_bz2_compress(params):
 
     Returns compressed data and compression ratio.
     """
-    import bz2
-
     data = hex_to_bytes(params['data'])
 
     compressed = bz2.compress(data)
@@ -2740,8 +2879,6 @@ def cmd_bz2_decompress(params):
 
     Returns decompressed data.
     """
-    import bz2
-
     compressed = hex_to_bytes(params['compressed'])
 
     decompressed = bz2.decompress(compressed)
@@ -2780,11 +2917,11 @@ def cmd_lxmf_pack(params):
     packed_payload = umsgpack.packb(payload)
 
     # Compute hash: SHA256(dest_hash + source_hash + packed_payload)
-    hashed_part = destination_hash + source_hash + packed_payload
-    message_hash = hashlib.sha256(hashed_part).digest()
+    hashed_part = b"".join((destination_hash, source_hash, packed_payload))
+    message_hash = _sha256(hashed_part).digest()
 
     # Signed part: hashed_part + hash
-    signed_part = hashed_part + message_hash
+    signed_part = b"".join((hashed_part, message_hash))
 
     return {
         'packed_payload': bytes_to_hex(packed_payload),
@@ -2821,8 +2958,7 @@ def cmd_lxmf_unpack(params):
         packed_payload = umsgpack.packb(unpacked_payload)
 
     # Compute hash (always without stamp)
-    hashed_part = destination_hash + source_hash + packed_payload
-    message_hash = hashlib.sha256(hashed_part).digest()
+    message_hash = _sha256_parts(destination_hash, source_hash, packed_payload)
 
     # Decode title/content
     title_bytes = unpacked_payload[1]
@@ -2849,20 +2985,30 @@ def serialize_field_value(value):
     Binary data is hex-encoded with type annotation.
     Lists/tuples are recursively serialized.
     """
-    if isinstance(value, bytes):
-        return {'type': 'bytes', 'hex': value.hex()}
-    elif isinstance(value, (list, tuple)):
-        return {'type': 'list', 'items': [serialize_field_value(v) for v in value]}
-    elif isinstance(value, dict):
-        return {'type': 'dict', 'items': {str(k): serialize_field_value(v) for k, v in value.items()}}
-    elif isinstance(value, int):
-        return {'type': 'int', 'value': value}
-    elif isinstance(value, float):
-        return {'type': 'float', 'value': value}
-    elif isinstance(value, str):
-        return {'type': 'str', 'value': value}
-    else:
-        return {'type': type(value).__name__, 'value': str(value)}
+    serializer = _FIELD_SERIALIZERS.get(type(value))
+    if serializer is None:
+        # Subclasses and other types: same precedence as an isinstance chain
+        for base, serializer in _FIELD_SERIALIZER_ORDER:
+            if isinstance(value, base):
+                break
+        else:
+            return {'type': type(value).__name__, 'value': str(value)}
+    return serializer(value)
+
+
+# Checked in this order for values whose exact type is not in the table
+_FIELD_SERIALIZER_ORDER = (
+    ((bytes,), lambda value: {'type': 'bytes', 'hex': bytes_to_hex(value)}),
+    ((list, tuple), lambda value: {'type': 'list', 'items': [serialize_field_value(v) for v in value]}),
+    ((dict,), lambda value: {'type': 'dict', 'items': {str(k): serialize_field_value(v) for k, v in value.items()}}),
+    ((int,), lambda value: {'type': 'int', 'value': value}),
+    ((float,), lambda value: {'type': 'float', 'value': value}),
+    ((str,), lambda value: {'type': 'str', 'value': value}),
+)
+
+# Exact-type dispatch, so the common field types need a single dict lookup
+_FIELD_SERIALIZERS = {base: serializer for bases, serializer in _FIELD_SERIALIZER_ORDER for base in bases}
+_FIELD_SERIALIZERS[bool] = _FIELD_SERIALIZERS[int]
 
 
 def cmd_lxmf_unpack_with_fields(params):
@@ -2910,14 +3056,23 @@ def cmd_lxmf_hash(params):
     # Build payload and hash
     payload = [timestamp, title_bytes, content_bytes, fields]
     packed_payload = umsgpack.packb(payload)
-    hashed_part = destination_hash + source_hash + packed_payload
-    message_hash = hashlib.sha256(hashed_part).digest()
+    message_hash = _sha256_parts(destination_hash, source_hash, packed_payload)
 
     return {
         'message_hash': bytes_to_hex(message_hash)
     }
 
 
+@functools.lru_cache(maxsize=16)
+def _stamp_workblock(message_id, expand_rounds):
+    """Return LXStamper.stamp_workblock(message_id, expand_rounds), computed once.
+
+    A workblock is 256 bytes per expand round (768 KB at the default 3000),
+    so only a few are kept.
+    """
+    return LXStamper.stamp_workblock(message_id, expand_rounds=expand_rounds)
+
+
 def cmd_lxmf_stamp_workblock(params):
     """Generate stamp workblock from message ID.
 
@@ -2927,7 +3082,7 @@ def cmd_lxmf_stamp_workblock(params):
     message_id = hex_to_bytes(params['message_id'])
     expand_rounds = int(params.get('expand_rounds', 3000))
 
-    workblock = LXStamper.stamp_workblock(message_id, expand_rounds=expand_rounds)
+    workblock = _stamp_workblock(message_id, expand_rounds)
 
     return {
         'workblock': bytes_to_hex(workblock),
@@ -2983,8 +3138,9 @@ _rns_instance = None
 _lxmf_router = None
 _lxmf_identity = None
 _lxmf_destination = None
-_received_messages = []
+_received_messages = collections.deque(maxlen=10000)  # oldest dropped first
 _rns_module = None  # Cached RNS module
+_lxmf_outbound_destinations = {}  # destination hash -> outbound lxmf.delivery Destination
 
 
 def _get_full_rns():
@@ -2999,7 +3155,6 @@ def _get_full_rns():
         return _rns_module
 
     import importlib
-    import sys
 
     # Remove ALL RNS-related modules to get a clean slate
     # This includes fake modules (RNS_HMAC, etc.) and any partial imports
@@ -3037,8 +3192,6 @@ def cmd_rns_start(params):
     """
     global _rns_instance
 
-    import tempfile
-
     tcp_port = int(params['tcp_port'])
     config_path = params.get('config_path')
 
@@ -3116,6 +3269,7 @@ def cmd_rns_stop(params):
         pass
 
     _rns_instance = None
+    _lxmf_outbound_destinations.clear()
 
     return {
         'stopped': True
@@ -3133,9 +3287,7 @@ def cmd_lxmf_start_router(params):
         identity_hash (hex): Hash of the router identity
         destination_hash (hex): Hash of the delivery destination
     """
-    global _lxmf_router, _lxmf_identity, _lxmf_destination, _received_messages
-
-    import tempfile
+    global _lxmf_router, _lxmf_identity, _lxmf_destination
 
     identity_hex = params.get('identity_hex')
     display_name = params.get('display_name')
@@ -3165,12 +3317,12 @@ def cmd_lxmf_start_router(params):
         display_name=display_name
     )
 
-    # Clear received messages
-    _received_messages = []
+    # Clear received messages and destinations resolved for the previous router
+    _received_messages.clear()
+    _lxmf_outbound_destinations.clear()
 
     # Set delivery callback
     def delivery_callback(message):
-        global _received_messages
         msg_data = {
             'source_hash': bytes_to_hex(message.source_hash),
             'destination_hash': bytes_to_hex(message.destination_hash),
@@ -3182,11 +3334,10 @@ def cmd_lxmf_start_router(params):
         if hasattr(message, 'hash') and message.hash:
             msg_data['hash'] = bytes_to_hex(message.hash)
         if hasattr(message, 'fields') and message.fields:
-            for k, v in message.fields.items():
-                if isinstance(v, bytes):
-                    msg_data['fields'][str(k)] = bytes_to_hex(v)
-                else:
-                    msg_data['fields'][str(k)] = v
+            msg_data['fields'] = {
+                str(k): bytes_to_hex(v) if isinstance(v, bytes) else v
+                for k, v in message.fields.items()
+            }
         _received_messages.append(msg_data)
 
     _lxmf_router.register_delivery_callback(delivery_callback)
@@ -3203,18 +3354,18 @@ def cmd_lxmf_get_messages(params):
 
     Returns list of received messages with decoded content.
     """
-    global _received_messages
+    # Snapshot once so the count matches even if a delivery lands meanwhile
+    messages = list(_received_messages)
 
     return {
-        'messages': _received_messages,
-        'count': len(_received_messages)
+        'messages': messages,
+        'count': len(messages)
     }
 
 
 def cmd_lxmf_clear_messages(params):
     """Clear received messages list."""
-    global _received_messages
-    _received_messages = []
+    _received_messages.clear()
 
     return {
         'cleared': True
@@ -3248,6 +3399,29 @@ def cmd_lxmf_announce(params):
     }
 
 
+def _lxmf_outbound_destination(RNS, destination_hash):
+    """Return the outbound lxmf.delivery Destination for destination_hash.
+
+    Destinations are reused across sends until the router or RNS instance is
+    restarted. Returns None, without caching, while no identity can be recalled.
+    """
+    destination = _lxmf_outbound_destinations.get(destination_hash)
+    if destination is None:
+        identity = RNS.Identity.recall(destination_hash)
+        if identity is None:
+            return None
+        # LXMF uses "lxmf" app name and "delivery" aspect
+        destination = RNS.Destination(
+            identity,
+            RNS.Destination.OUT,
+            RNS.Destination.SINGLE,
+            "lxmf",
+            "delivery"
+        )
+        _lxmf_outbound_destinations[destination_hash] = destination
+    return destination
+
+
 def cmd_lxmf_send_direct(params):
     """Send LXMF message via DIRECT delivery.
 
@@ -3287,10 +3461,10 @@ def cmd_lxmf_send_direct(params):
     if fields:
         fields = {int(k): v for k, v in fields.items()}
 
-    # Try to find the identity for this destination from recalled identities
+    # Find the delivery destination from recalled identities
     # This is needed because LXMF requires a proper Destination object
-    identity = RNS.Identity.recall(destination_hash)
-    if identity is None:
+    destination = _lxmf_outbound_destination(RNS, destination_hash)
+    if destination is None:
         # Check if we have a path at least
         has_path = RNS.Transport.has_path(destination_hash)
         return {
@@ -3300,16 +3474,6 @@ def cmd_lxmf_send_direct(params):
             'has_path': has_path
         }
 
-    # Create an LXMF delivery destination from the recalled identity
-    # LXMF uses "lxmf" app name and "delivery" aspect
-    destination = RNS.Destination(
-        identity,
-        RNS.Destination.OUT,
-        RNS.Destination.SINGLE,
-        "lxmf",
-        "delivery"
-    )
-
     # Create a message with DIRECT method
     message = LXMF.LXMessage(
         destination=destination,
@@ -3367,23 +3531,14 @@ def cmd_lxmf_send_opportunistic(params):
     if fields:
         fields = {int(k): v for k, v in fields.items()}
 
-    # Recall identity from destination hash
-    identity = RNS.Identity.recall(destination_hash)
-    if identity is None:
+    # Recall the outbound destination from destination hash
+    destination = _lxmf_outbound_destination(RNS, destination_hash)
+    if destination is None:
         return {
             'sent': False,
             'error': f'Cannot recall identity for {destination_hash.hex()}'
         }
 
-    # Create outbound destination
-    destination = RNS.Destination(
-        identity,
-        RNS.Destination.OUT,
-        RNS.Destination.SINGLE,
-        "lxmf",
-        "delivery"
-    )
-
     # Create LXMF message with OPPORTUNISTIC method
     message = LXMF.LXMessage(
         destination=destination,
@@ -3651,7 +3806,7 @@ def cmd_propagation_node_submit_for_recipient(params):
     image_hex = params.get('image_hex', None)
     image_extension = params.get('image_extension', None)
     if image_hex and image_extension:
-        image_bytes = bytes.fromhex(image_hex)
+        image_bytes = hex_to_bytes(image_hex)
         message.fields = {
             LXMF.FIELD_IMAGE: [
                 image_extension.encode('utf-8'),
@@ -3667,7 +3822,6 @@ def cmd_propagation_node_submit_for_recipient(params):
     # message.pack() with PROPAGATED method computes __pn_encrypted_data internally.
     # lxmf_propagation() expects raw: dest_hash(16) + encrypted_data (NOT the
     # msgpack([time, [data]]) wrapper that propagation_packed contains).
-    import time
     encrypted_data = recipient_destination.encrypt(message.packed[LXMF.LXMessage.DESTINATION_LENGTH:])
     lxmf_data = message.packed[:LXMF.LXMessage.DESTINATION_LENGTH] + encrypted_data
     transient_id = RNS.Identity.full_hash(lxmf_data)
@@ -3991,7 +4145,6 @@ def cmd_rns_enable_ratchets(params):
 
     RNS = _get_full_rns()
 
-    import tempfile
     # enable_ratchets expects a FILE path, not a directory
     ratchet_path = params.get('ratchet_path')
     if not ratchet_path:
@@ -4395,7 +4548,6 @@ def _local_client_read_loop(sock):
     import socket as _socket
     global _local_client_running
     buf = bytearray()
-    in_frame = False
 
     try:
         while _local_client_running:
@@ -4408,26 +4560,24 @@ def _local_client_read_loop(sock):
             if not chunk:
                 break
 
-            for b in chunk:
-                if b == HDLC_FLAG:
-                    if in_frame and len(buf) > 0:
-                        # End of frame — unescape and store
-                        unescaped = bytearray()
-                        i = 0
-                        while i < len(buf):
-                            if buf[i] == HDLC_ESC and i + 1 < len(buf):
-                                unescaped.append(buf[i + 1] ^ HDLC_ESC_MASK)
-                                i += 2
-                            else:
-                                unescaped.append(buf[i])
-                                i += 1
-                        with _local_client_lock:
-                            _local_client_packets.append(bytes(unescaped))
-                    # Start new frame
-                    buf = bytearray()
-                    in_frame = True
-                elif in_frame:
-                    buf.append(b)
+            buf += chunk
+            start = buf.find(_HDLC_FLAG_BYTE)
+            if start == -1:
+                # Not inside a frame yet
+                buf.clear()
+                continue
+            while True:
+                end = buf.find(_HDLC_FLAG_BYTE, start + 1)
+                if end == -1:
+                    break
+                if end > start + 1:
+                    # End of frame — unescape and store
+                    packet = _hdlc_unescape(bytes(buf[start + 1:end]))
+                    with _local_client_lock:
+                        _local_client_packets.append(packet)
+                # The closing flag opens the next frame
+                start = end
+            del buf[:start]
     except Exception:
         pass
     finally:
@@ -4444,7 +4594,6 @@ def cmd_local_client_connect(params):
         connected (bool)
     """
     import socket
-    import threading
 
     global _local_client_socket, _local_client_thread
     global _local_client_packets, _local_client_running
@@ -4479,8 +4628,6 @@ def cmd_local_client_read_packets(params):
         packets (list of hex strings)
         count (int)
     """
-    import time
-
     timeout_ms = int(params.get('timeout_ms', 5000))
     deadline = time.time() + timeout_ms / 1000.0
 
@@ -4545,11 +4692,7 @@ def cmd_packet_parse_header(params):
     flags = raw[0]
     hops = raw[1]
 
-    header_type     = (flags >> 6) & 0x01
-    context_flag    = (flags >> 5) & 0x01
-    transport_type  = (flags >> 4) & 0x01
-    destination_type = (flags >> 2) & 0x03
-    packet_type     = flags & 0x03
+    header_type, context_flag, transport_type, destination_type, packet_type = _FLAGS_DECODE[flags]
 
     HASH_LEN = 16
 
@@ -4646,7 +4789,6 @@ def cmd_propagation_encrypt_for_recipient(params):
 def cmd_get_test_identity(params):
     """Get a consistent test identity for interop testing."""
     # Create a deterministic identity for testing
-    import hashlib
     seed = hashlib.sha256(b"test_identity_seed_for_interop").digest()
 
     # Create identity with deterministic keys
@@ -4692,15 +4834,15 @@ def cmd_get_test_identity(params):
     test_identity.update_hashes()
 
     return {
-        "identity_bytes": test_identity.get_public_key().hex(),
-        "identity_hash": test_identity.hash.hex(),
-        "private_bytes": test_identity.get_private_key().hex()
+        "identity_bytes": bytes_to_hex(test_identity.get_public_key()),
+        "identity_hash": bytes_to_hex(test_identity.hash),
+        "private_bytes": bytes_to_hex(test_identity.get_private_key())
     }
 
 def cmd_extract_ratchet_from_announce(params):
     """Extract ratchet from an announce packet."""
-    destination_hash = bytes.fromhex(params['destination_hash'])
-    announce_data = bytes.fromhex(params['announce_data'])
+    destination_hash = hex_to_bytes(params['destination_hash'])
+    announce_data = hex_to_bytes(params['announce_data'])
 
     # Create a mock packet to validate the announce
     class MockPacket:
@@ -4738,7 +4880,7 @@ def cmd_extract_ratchet_from_announce(params):
         # If validation succeeded and ratchet was present, get it from known_ratchets
         stored_ratchet = RNS.Identity.get_ratchet(destination_hash)
         if stored_ratchet:
-            return {"ratchet": stored_ratchet.hex()}
+            return {"ratchet": bytes_to_hex(stored_ratchet)}
         else:
             raise Exception("Announce validated but no ratchet was stored")
     else:
@@ -4746,9 +4888,9 @@ def cmd_extract_ratchet_from_announce(params):
 
 def cmd_encrypt_with_stored_ratchet(params):
     """Encrypt a message using the stored ratchet for a destination."""
-    destination_hash = bytes.fromhex(params['destination_hash'])
-    identity_bytes = bytes.fromhex(params['identity_bytes'])
-    message = bytes.fromhex(params['message'])
+    destination_hash = hex_to_bytes(params['destination_hash'])
+    identity_bytes = hex_to_bytes(params['identity_bytes'])
+    message = hex_to_bytes(params['message'])
 
     # Create identity from bytes for encryption
     identity = RNS.Identity(create_keys=False)
@@ -4769,18 +4911,18 @@ def cmd_encrypt_with_stored_ratchet(params):
     # Encrypt using the destination (will use stored ratchet if available)
     encrypted = destination.encrypt(message)
 
-    return {"encrypted": encrypted.hex()}
+    return {"encrypted": bytes_to_hex(encrypted)}
 
 def cmd_debug_encryption_details(params):
     """Get debug details about encryption for a destination."""
-    destination_hash = bytes.fromhex(params['destination_hash'])
+    destination_hash = hex_to_bytes(params['destination_hash'])
 
     # Get stored ratchet
     stored_ratchet = RNS.Identity.get_ratchet(destination_hash)
 
     return {
         "has_stored_ratchet": stored_ratchet is not None,
-        "stored_ratchet": stored_ratchet.hex() if stored_ratchet else None,
+        "stored_ratchet": bytes_to_hex(stored_ratchet) if stored_ratchet else None,
         "ratchet_expiry": RNS.Identity.RATCHET_EXPIRY,
         "known_ratchets_count": len(RNS.Identity.known_ratchets)
     }
@@ -4947,13 +5089,78 @@ COMMANDS = {
 }
 
 
+# Commands that touch no process-wide state (no RNS/LXMF instances, stored
+# messages or links) and so may run in worker processes with --parallel.
+# lxmf_stamp_generate is excluded because LXStamper spawns its own processes.
+POOL_SAFE_COMMANDS = frozenset([
+    'x25519_generate', 'x25519_public_from_private', 'x25519_exchange',
+    'ed25519_generate', 'ed25519_sign', 'ed25519_verify',
+    'sha256', 'sha512', 'hmac_sha256', 'hkdf', 'pkcs7_pad', 'pkcs7_unpad',
+    'aes_encrypt', 'aes_decrypt', 'token_encrypt', 'token_decrypt', 'token_verify_hmac',
+    'identity_from_private_key', 'identity_encrypt', 'identity_decrypt',
+    'identity_sign', 'identity_verify', 'identity_hash',
+    'destination_hash', 'truncated_hash', 'name_hash',
+    'packet_flags', 'packet_parse_flags', 'packet_pack', 'packet_unpack', 'packet_hash',
+    'packet_parse_header', 'hdlc_escape', 'hdlc_frame', 'kiss_escape', 'kiss_frame',
+    'link_id_from_packet', 'link_derive_key', 'link_encrypt', 'link_decrypt',
+    'link_prove', 'link_verify_proof', 'link_signalling_bytes', 'link_parse_signalling',
+    'link_rtt_pack', 'link_rtt_unpack', 'link_request_pack', 'link_request_unpack',
+    'link_response_pack', 'link_response_unpack',
+    'ratchet_id', 'ratchet_public_from_private', 'ratchet_derive_key', 'ratchet_encrypt',
+    'ratchet_decrypt', 'ratchet_storage_format', 'ratchet_extract_from_announce',
+    'random_hash', 'announce_pack', 'announce_unpack', 'announce_sign', 'announce_verify',
+    'envelope_pack', 'envelope_unpack', 'stream_msg_pack', 'stream_msg_unpack',
+    'path_entry_serialize', 'path_entry_deserialize', 'path_request_pack', 'path_request_unpack',
+    'packet_hashlist_pack', 'packet_hashlist_unpack',
+    'resource_adv_pack', 'resource_adv_unpack', 'resource_hash', 'resource_flags',
+    'hashmap_pack', 'resource_map_hash', 'resource_build_hashmap', 'resource_proof',
+    'resource_find_part', 'ifac_derive_key', 'ifac_compute', 'ifac_verify',
+    'bz2_compress', 'bz2_decompress',
+    'lxmf_pack', 'lxmf_unpack', 'lxmf_unpack_with_fields', 'lxmf_hash',
+    'lxmf_stamp_workblock', 'lxmf_stamp_valid',
+])
+
+
+def _handle_batch_entry(entry):
+    """Process one request of a batch; batches cannot be nested."""
+    if isinstance(entry, dict) and entry.get('batch') is not None:
+        return {
+            'id': entry.get('id', 'unknown'),
+            'success': False,
+            'error': "Nested batches are not supported"
+        }
+    return handle_request(entry)
+
+
 def handle_request(request):
-    """Process a single request and return response."""
+    """Process a single request (or a batch of them) and return response."""
+    if not isinstance(request, dict):
+        return {
+            'id': 'unknown',
+            'success': False,
+            'error': f"Request must be an object, got {type(request).__name__}"
+        }
+
     req_id = request.get('id', 'unknown')
+    batch = request.get('batch')
+    if batch is not None:
+        if not isinstance(batch, list):
+            return {
+                'id': req_id,
+                'success': False,
+                'error': f"batch must be a list, got {type(batch).__name__}"
+            }
+        return {
+            'id': req_id,
+            'batch': [_handle_batch_entry(entry) for entry in batch]
+        }
+
     command = request.get('command')
     params = request.get('params', {})
 
-    if command not in COMMANDS:
+    # A list or dict command would make the lookup raise TypeError
+    handler = COMMANDS.get(command) if isinstance(command, str) else None
+    if handler is None:
         return {
             'id': req_id,
             'success': False,
@@ -4961,7 +5168,7 @@ def handle_request(request):
         }
 
     try:
-        result = COMMANDS[command](params)
+        result = handler(params)
         return {
             'id': req_id,
             'success': True,
@@ -4976,28 +5183,98 @@ def handle_request(request):
         }
 
 
+def _pending_input(stream):
+    """Return True if more request data can be read without blocking."""
+    try:
+        readable, _, _ = select.select([stream], [], [], 0)
+    except (OSError, ValueError):
+        return False  # e.g. pipes on Windows: flush after every response
+    return bool(readable)
+
+
+def _warmup():
+    """Exercise each crypto backend once so the first request doesn't pay
+    for lazy imports, OpenSSL initialisation and cold caches."""
+    seed = bytes(32)
+    signing_key = Ed25519SigningKey(seed)
+    Ed25519VerifyingKey(signing_key.vk_s).verify(signing_key.sign(b""), b"")
+    prv = X25519.X25519PrivateKey.from_private_bytes(seed)
+    prv.exchange(prv.public_key())
+    token_obj = Token.Token(bytes(64))
+    _token_decrypt(token_obj, _token_encrypt_with_iv(token_obj, b"", bytes(16)))
+    _hkdf(length=64, derive_from=seed)
+    _decode_request(_encode_response({'warmup': bytes_to_hex(_sha256(seed).digest())}))
+
+
 def main():
-    """Main server loop."""
+    """Main server loop.
+
+    With --parallel, POOL_SAFE_COMMANDS are handed to a process pool and
+    their responses are written as they complete, so responses may arrive
+    out of request order and clients must match them up by id. All other
+    commands are still handled inline, in order.
+    """
+    executor = None
+    if '--parallel' in sys.argv[1:]:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count())
+
+    _warmup()
+
     # Signal ready
     print("READY", flush=True)
 
-    # Process commands
-    for line in sys.stdin:
-        line = line.strip()
-        if not line:
-            continue
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+    write_lock = threading.Lock()
+
+    # Bound locally: these are looked up on every request
+    loads = _decode_request
+    dumps = _encode_response
+    write = _write_response
+    handle = handle_request
+    pending_input = _pending_input
 
+    def write_pooled(req_id, future):
+        # Runs on the executor's result thread as each worker finishes
         try:
-            request = json.loads(line)
-            response = handle_request(request)
-            print(json.dumps(response), flush=True)
-        except json.JSONDecodeError as e:
-            error_response = {
+            response = future.result()
+        except Exception as e:
+            response = {
+                'id': req_id,
+                'success': False,
+                'error': f"{type(e).__name__}: {str(e)}"
+            }
+        with write_lock:
+            _write_response(stdout, _encode_response(response))
+            stdout.flush()
+
+    # Process commands. Responses are written as they are produced but only
+    # flushed once no further request is already waiting, so a burst of
+    # pipelined requests costs one flush instead of one per response.
+    for payload in _read_requests(stdin):
+        try:
+            request = loads(payload)
+            if (executor is not None and isinstance(request, dict)
+                    and isinstance(request.get('command'), str)
+                    and request['command'] in POOL_SAFE_COMMANDS):
+                future = executor.submit(handle_request, request)
+                future.add_done_callback(functools.partial(write_pooled, request.get('id', 'unknown')))
+                continue
+            response = handle(request)
+        except _DECODE_ERRORS as e:
+            response = {
                 'id': 'parse_error',
                 'success': False,
-                'error': f"JSON parse error: {e}"
+                'error': f"{_TRANSPORT_FORMAT} parse error: {e}"
             }
-            print(json.dumps(error_response), flush=True)
+        with write_lock:
+            write(stdout, dumps(response))
+            if not pending_input(stdin):
+                stdout.flush()
+
+    if executor is not None:
+        executor.shutdown(wait=True)
+    stdout.flush()
 
 
 if __name__ == '__main__':
@@ -66,7 +66,7 @@ class PythonBridge private constructor(
             return PythonBridge(process, writer, reader)
         }
 
-        private fun findBridgeScript(): File {
+        internal fun findBridgeScript(): File {
             // Try various paths to find the bridge script
             val candidates = listOf(
                 // From project root
@@ -0,0 +1,214 @@
+package network.reticulum.interop.bridge
+
+import io.kotest.matchers.shouldBe
+import kotlinx.serialization.json.Json
+import kotlinx.serialization.json.JsonObject
+import kotlinx.serialization.json.jsonArray
+import kotlinx.serialization.json.jsonObject
+import kotlinx.serialization.json.jsonPrimitive
+import network.reticulum.crypto.defaultCryptoProvider
+import network.reticulum.interop.PythonBridge
+import network.reticulum.interop.toHex
+import org.junit.jupiter.api.DisplayName
+import org.junit.jupiter.api.Test
+import org.msgpack.core.MessagePack
+import org.msgpack.value.Value
+import org.msgpack.value.ValueFactory
+import java.io.BufferedReader
+import java.io.DataInputStream
+import java.io.DataOutputStream
+import java.util.Base64
+
+/**
+ * Tests for the bridge protocol modes that [PythonBridge] itself does not use.
+ *
+ * Each test spawns its own bridge process with the relevant environment
+ * and talks to it directly.
+ */
+@DisplayName("Bridge Protocol")
+class BridgeProtocolTest {
+
+    private val crypto = defaultCryptoProvider()
+
+    private fun startBridge(env: Map<String, String> = emptyMap(), vararg args: String): Process {
+        val bridgeScript = PythonBridge.findBridgeScript()
+        val processBuilder = ProcessBuilder(listOf("python3", bridgeScript.absolutePath) + args)
+            .directory(bridgeScript.parentFile.parentFile)
+            .redirectError(ProcessBuilder.Redirect.INHERIT)
+
+        processBuilder.environment()["PYTHON_RNS_PATH"] =
+            System.getenv("PYTHON_RNS_PATH") ?: "../../../Reticulum"
+        processBuilder.environment().putAll(env)
+
+        return processBuilder.start()
+    }
+
+    private fun <T> withJsonBridge(
+        env: Map<String, String> = emptyMap(),
+        vararg args: String,
+        block: (send: (String) -> Unit, reader: BufferedReader) -> T
+    ): T {
+        val process = startBridge(env, *args)
+        try {
+            val writer = process.outputStream.bufferedWriter()
+            val reader = process.inputStream.bufferedReader()
+            reader.readLine() shouldBe "READY"
+
+            val send = { line: String ->
+                writer.write(line)
+                writer.newLine()
+                writer.flush()
+            }
+            return block(send, reader)
+        } finally {
+            process.destroy()
+        }
+    }
+
+    private fun JsonObject.result(): JsonObject {
+        this["success"]?.jsonPrimitive?.content shouldBe "true"
+        return this["result"]!!.jsonObject
+    }
+
+    @Test
+    @DisplayName("base64 byte encoding round-trips")
+    fun `base64 byte encoding round-trips`() {
+        val b64 = Base64.getEncoder()
+        val data = ByteArray(100) { it.toByte() }
+        val publicKey = ByteArray(64) { (it * 3).toByte() }
+
+        withJsonBridge(mapOf("BRIDGE_BYTES_ENCODING" to "base64")) { send, reader ->
+            send("""{"id":"1","command":"sha256","params":{"data":"${b64.encodeToString(data)}"}}""")
+            val hash = Json.parseToJsonElement(reader.readLine()).jsonObject.result()
+            Base64.getDecoder().decode(hash["hash"]!!.jsonPrimitive.content).toHex() shouldBe
+                crypto.sha256(data).toHex()
+
+            send("""{"id":"2","command":"identity_hash","params":{"public_key":"${b64.encodeToString(publicKey)}"}}""")
+            val identityHash = Json.parseToJsonElement(reader.readLine()).jsonObject.result()
+            Base64.getDecoder().decode(identityHash["full_hash"]!!.jsonPrimitive.content).toHex() shouldBe
+                crypto.sha256(publicKey).toHex()
+
+            val privateKey = ByteArray(64) { (it + 1).toByte() }
+            send("""{"id":"3","command":"identity_from_private_key","params":{"private_key":"${b64.encodeToString(privateKey)}"}}""")
+            val identity = Json.parseToJsonElement(reader.readLine()).jsonObject.result()
+            val derivedPublicKey = Base64.getDecoder().decode(identity["public_key"]!!.jsonPrimitive.content)
+            val expectedHash = crypto.sha256(derivedPublicKey).copyOf(16)
+            identity["hash"]!!.jsonPrimitive.content shouldBe b64.encodeToString(expectedHash)
+            // hexhash mirrors RNS's Identity.hexhash and stays hex
+            identity["hexhash"]!!.jsonPrimitive.content shouldBe expectedHash.toHex()
+        }
+    }
+
+    @Test
+    @DisplayName("parallel mode responses correlate by id")
+    fun `parallel mode responses correlate by id`() {
+        val inputs = (0 until 64).associate { i -> "req-$i" to ByteArray(i * 100) { (it + i).toByte() } }
+
+        val responses = withJsonBridge(emptyMap(), "--parallel") { send, reader ->
+            for ((id, data) in inputs) {
+                send("""{"id":"$id","command":"sha256","params":{"data":"${data.toHex()}"}}""")
+            }
+            // Not pool-safe, so answered inline while the pool is still busy
+            send("""{"id":"inline","command":"no_such_command","params":{}}""")
+
+            (0..inputs.size).associate {
+                val response = Json.parseToJsonElement(reader.readLine()).jsonObject
+                response["id"]!!.jsonPrimitive.content to response
+            }
+        }
+
+        responses.keys shouldBe inputs.keys + "inline"
+        for ((id, data) in inputs) {
+            responses.getValue(id).result()["hash"]!!.jsonPrimitive.content shouldBe crypto.sha256(data).toHex()
+        }
+        responses.getValue("inline")["success"]!!.jsonPrimitive.content shouldBe "false"
+    }
+
+    @Test
+    @DisplayName("msgpack transport round-trips raw bytes")
+    fun `msgpack transport round-trips raw bytes`() {
+        val data = ByteArray(300) { it.toByte() }
+
+        val process = startBridge(mapOf("BRIDGE_TRANSPORT" to "msgpack"))
+        try {
+            val output = DataOutputStream(process.outputStream.buffered())
+            val input = DataInputStream(process.inputStream.buffered())
+
+            // READY is still sent as a text line before the first frame
+            val ready = generateSequence { input.read().takeIf { it != '\n'.code && it != -1 } }
+                .map { it.toChar() }.joinToString("")
+            ready shouldBe "READY"
+
+            fun call(id: String, command: String, params: Map<String, Value>): Map<String, Value> {
+                val packer = MessagePack.newDefaultBufferPacker()
+                packer.packValue(
+                    ValueFactory.newMap(
+                        mapOf(
+                            ValueFactory.newString("id") to ValueFactory.newString(id),
+                            ValueFactory.newString("command") to ValueFactory.newString(command),
+                            ValueFactory.newString("params") to ValueFactory.newMap(
+                                params.mapKeys { ValueFactory.newString(it.key) }
+                            )
+                        )
+                    )
+                )
+                val request = packer.toByteArray()
+                output.writeInt(request.size)
+                output.write(request)
+                output.flush()
+
+                val payload = ByteArray(input.readInt())
+                input.readFully(payload)
+                val response = MessagePack.newDefaultUnpacker(payload).unpackValue().asMapValue().map()
+                return response.mapKeys { it.key.asStringValue().asString() }
+            }
+
+            val response = call("1", "sha256", mapOf("data" to ValueFactory.newBinary(data)))
+            response.getValue("id").asStringValue().asString() shouldBe "1"
+            response.getValue("success").asBooleanValue().boolean shouldBe true
+            val result = response.getValue("result").asMapValue().map()
+            result.getValue(ValueFactory.newString("hash")).asBinaryValue().asByteArray().toHex() shouldBe
+                crypto.sha256(data).toHex()
+
+            // Non-bin byte fields are rejected rather than coerced
+            val rejected = call("2", "sha256", mapOf("data" to ValueFactory.newInteger(5)))
+            rejected.getValue("success").asBooleanValue().boolean shouldBe false
+        } finally {
+            process.destroy()
+        }
+    }
+
+    @Test
+    @DisplayName("malformed batches are answered with errors")
+    fun `malformed batches are answered with errors`() {
+        withJsonBridge { send, reader ->
+            send(
+                """{"id":"b","batch":[""" +
+                    """{"id":"1","command":"sha256","params":{"data":"00"}},""" +
+                    """5,""" +
+                    """{"id":"nested","batch":[{"id":"2","command":"sha256","params":{"data":"00"}}]},""" +
+                    """{"id":"listCommand","command":["sha256"]}""" +
+                    """]}"""
+            )
+            val entries = Json.parseToJsonElement(reader.readLine()).jsonObject["batch"]!!.jsonArray.map { it.jsonObject }
+            entries.size shouldBe 4
+            entries[0].result()["hash"]!!.jsonPrimitive.content shouldBe crypto.sha256(byteArrayOf(0)).toHex()
+            entries[1]["success"]!!.jsonPrimitive.content shouldBe "false"
+            entries[2]["id"]!!.jsonPrimitive.content shouldBe "nested"
+            entries[2]["success"]!!.jsonPrimitive.content shouldBe "false"
+            entries[3]["id"]!!.jsonPrimitive.content shouldBe "listCommand"
+            entries[3]["success"]!!.jsonPrimitive.content shouldBe "false"
+            entries[3]["error"]!!.jsonPrimitive.content.startsWith("Unknown command") shouldBe true
+
+            send("""{"id":"c","batch":5}""")
+            val notList = Json.parseToJsonElement(reader.readLine()).jsonObject
+            notList["id"]!!.jsonPrimitive.content shouldBe "c"
+            notList["success"]!!.jsonPrimitive.content shouldBe "false"
+
+            // The bridge keeps serving requests afterwards
+            send("""{"id":"d","command":"sha256","params":{"data":""}}""")
+            Json.parseToJsonElement(reader.readLine()).jsonObject.result()["hash"]!!.jsonPrimitive.content shouldBe
+                crypto.sha256(ByteArray(0)).toHex()
+        }
+    }
+}
@@ -24,6 +24,7 @@ import os
 import threading
 import time
 import binascii
+import collections
 
 # Suppress RNS logging
 os.environ["RNS_LOG_LEVEL"] = "7"  # LOG_CRITICAL - suppress most output
@@ -37,15 +38,27 @@ class HDLC:
     ESC = 0x7D
     ESC_MASK = 0x20
 
+    # Byte strings built once rather than on every frame
+    FLAG_BYTE = bytes([FLAG])
+    ESC_BYTE = bytes([ESC])
+    ESCAPED_ESC = bytes([ESC, ESC ^ ESC_MASK])
+    ESCAPED_FLAG = bytes([ESC, FLAG ^ ESC_MASK])
+
     @staticmethod
     def escape(data):
-        data = data.replace(bytes([HDLC.ESC]), bytes([HDLC.ESC, HDLC.ESC ^ HDLC.ESC_MASK]))
-        data = data.replace(bytes([HDLC.FLAG]), bytes([HDLC.ESC, HDLC.FLAG ^ HDLC.ESC_MASK]))
+        data = data.replace(HDLC.ESC_BYTE, HDLC.ESCAPED_ESC)
+        data = data.replace(HDLC.FLAG_BYTE, HDLC.ESCAPED_FLAG)
         return data
 
+    @staticmethod
+    def unescape(frame):
+        frame = frame.replace(HDLC.ESCAPED_FLAG, HDLC.FLAG_BYTE)
+        frame = frame.replace(HDLC.ESCAPED_ESC, HDLC.ESC_BYTE)
+        return frame
+
     @staticmethod
     def frame(data):
-        return bytes([HDLC.FLAG]) + HDLC.escape(data) + bytes([HDLC.FLAG])
+        return HDLC.FLAG_BYTE + HDLC.escape(data) + HDLC.FLAG_BYTE
 
 
 class MinimalTCPServer:
@@ -56,7 +69,7 @@ class MinimalTCPServer:
         self.client_socket = None
         self.running = True
         self.lock = threading.Lock()
-        self.received_frames = []
+        self.received_frames = collections.deque()  # appends are thread-safe
 
     def start(self):
         """Start the TCP server."""
@@ -98,7 +111,7 @@ class MinimalTCPServer:
 
     def _read_loop(self, sock):
         """Read and deframe incoming data using HDLC framing."""
-        frame_buffer = b""
+        frame_buffer = bytearray()
 
         try:
             while self.running:
@@ -108,30 +121,28 @@ class MinimalTCPServer:
                         break
 
                     # HDLC deframing (same algorithm as RNS TCPInterface)
-                    frame_buffer += data
+                    frame_buffer.extend(data)
 
                     while True:
-                        frame_start = frame_buffer.find(bytes([HDLC.FLAG]))
+                        frame_start = frame_buffer.find(HDLC.FLAG)
                         if frame_start == -1:
                             break
 
-                        frame_end = frame_buffer.find(bytes([HDLC.FLAG]), frame_start + 1)
+                        frame_end = frame_buffer.find(HDLC.FLAG, frame_start + 1)
                         if frame_end == -1:
                             break
 
-                        frame = frame_buffer[frame_start + 1:frame_end]
-                        frame_buffer = frame_buffer[frame_end:]
+                        # Trim consumed bytes in place instead of copying the remainder
+                        frame = bytes(frame_buffer[frame_start + 1:frame_end])
+                        del frame_buffer[:frame_end]
 
-                        # Unescape
-                        frame = frame.replace(bytes([HDLC.ESC, HDLC.FLAG ^ HDLC.ESC_MASK]), bytes([HDLC.FLAG]))
-                        frame = frame.replace(bytes([HDLC.ESC, HDLC.ESC ^ HDLC.ESC_MASK]), bytes([HDLC.ESC]))
+                        frame = HDLC.unescape(frame)
 
                         # Report received frame (skip empty keepalive frames)
                         if len(frame) > 0:
                             hex_data = binascii.hexlify(frame).decode('ascii')
                             print(f"RECEIVED: {hex_data}", flush=True)
-                            with self.lock:
-                                self.received_frames.append(frame)
+                            self.received_frames.append(frame)
 
                 except socket.timeout:
                     continue